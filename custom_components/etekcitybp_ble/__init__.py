@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from bleak_retry_connector import close_stale_connections_by_address
-
+import asyncio
 import logging
+import time
 
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
@@ -16,19 +16,39 @@ from homeassistant.const import (
 )
 from homeassistant.core import CoreState, HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import slugify
 
+from .const import CONF_DEVICE_COMMANDS, CONF_PERSONS, CONF_TRACE, DOMAIN
 from .coordinator import EtekcityConfigEntry, EtekcityBPCoordinator
 from .device import EtekcityBPDevice
+from .history import EtekcityBPHistory
+from .people import async_get_people
+from .predictor import EtekcityBPSchedulePredictor
+from .services import async_setup_services
+from .trace import EtekcityBPTracer
+from .websocket_api import async_setup_websocket_api
 
 
 PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 _LOGGER = logging.getLogger(__name__)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the EtekcityBP integration."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: EtekcityConfigEntry) -> bool:
     """Set up Etekcity Blood Pressure BLE device from a config entry."""
+    setup_started = time.perf_counter()
     assert entry.unique_id is not None
     if CONF_ADDRESS not in entry.data and CONF_MAC in entry.data:
         # Bleak uses addresses not mac addresses which are actually
@@ -47,28 +67,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: EtekcityConfigEntry) ->
 
     connectable = True
 
-    await close_stale_connections_by_address(address)
-
     device = EtekcityBPDevice()
 
+    history = EtekcityBPHistory(hass, entry.entry_id)
+    predictor = EtekcityBPSchedulePredictor(hass, entry.entry_id)
+    await asyncio.gather(history.async_load(), predictor.async_load())
+
+    tracer = None
+    if entry.options.get(CONF_TRACE):
+        tracer = EtekcityBPTracer(
+            hass, address, hass.config.path(f"{DOMAIN}_trace_{slugify(address)}.jsonl")
+        )
+
     coordinator = entry.runtime_data = EtekcityBPCoordinator(
         hass,
         _LOGGER,
         address,
         device,
+        history,
+        predictor,
         entry.unique_id,
         entry.data.get(CONF_NAME, entry.title),
         connectable,
+        tracer,
+        entry.options.get(CONF_DEVICE_COMMANDS, False),
     )
 
     entry.async_on_unload(coordinator.async_start())
 
+    people = async_get_people(hass)
+    for user, conf_person in enumerate(CONF_PERSONS):
+        if person := entry.options.get(conf_person):
+            entry.async_on_unload(people.async_add_source(person, address, user, history))
+    entry.async_on_unload(lambda: people.async_release(entry.entry_id))
+
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(
         entry, PLATFORMS
     )
 
+    # Polling waits for this, entities are available with their restored state meanwhile
+    entry.async_create_background_task(
+        hass,
+        coordinator.async_close_stale_connections(),
+        f"{DOMAIN} close stale connections {address}",
+    )
+
+    _LOGGER.debug(
+        f"Set up {address} in {(time.perf_counter() - setup_started) * 1000:.1f} ms"
+    )
     return True
 
 async def _async_update_listener(hass: HomeAssistant, entry: EtekcityConfigEntry) -> None:
@@ -83,3 +131,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: EtekcityConfigEntry) ->
         if coordinator is not None:
             await coordinator.async_unload_entry()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: EtekcityConfigEntry) -> None:
+    """Remove the stored history and schedule of a deleted config entry."""
+    await asyncio.gather(
+        EtekcityBPHistory(hass, entry.entry_id).async_remove(),
+        EtekcityBPSchedulePredictor(hass, entry.entry_id).async_remove(),
+    )
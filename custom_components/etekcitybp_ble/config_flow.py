@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from typing import Any
 
 import voluptuous as vol
@@ -10,16 +11,34 @@ from homeassistant.components.bluetooth import (
     BluetoothServiceInfoBleak,
     async_discovered_service_info,
 )
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_ADDRESS
+from homeassistant.config_entries import (
+    SOURCE_USER,
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_ADDRESS, CONF_NAME
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.selector import EntitySelector, EntitySelectorConfig
 
 from .device import EtekcityBPDevice
-from .const import DOMAIN
+from .const import (
+    CONF_DEVICE_COMMANDS,
+    CONF_PERSONS,
+    CONF_TRACE,
+    DOMAIN,
+    MFR_ID,
+)
 
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_ADDRESSES = "addresses"
+
 
 class EtekcityBPConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for EtekcityBP."""
@@ -31,6 +50,13 @@ class EtekcityBPConfigFlow(ConfigFlow, domain=DOMAIN):
         self._discovery_info: BluetoothServiceInfoBleak | None = None
         # self._discovered_device: EtekcityBPDevice | None = None
         self._discovered_devices: dict[str, str] = {}
+        self._device_labels: dict[str, str] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return EtekcityBPOptionsFlow()
 
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfoBleak
@@ -65,30 +91,78 @@ class EtekcityBPConfigFlow(ConfigFlow, domain=DOMAIN):
             step_id="bluetooth_confirm", description_placeholders=placeholders
         )
 
+    async def _async_add_selected_device(self, address: str) -> bool:
+        """Add a further monitor selected in the user step, return if it was added.
+
+        Creating the entry aborts the discovery flow of the monitor.
+        """
+        result = await self.hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": SOURCE_USER},
+            data={CONF_ADDRESS: address, CONF_NAME: self._discovered_devices[address]},
+        )
+        if result["type"] is FlowResultType.CREATE_ENTRY or (
+            result["type"] is FlowResultType.ABORT
+            and result["reason"] == "already_configured"
+        ):
+            del self._discovered_devices[address]
+            del self._device_labels[address]
+            return True
+        _LOGGER.warning(f"Could not add {address}: {result.get('reason')}")
+        return False
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Handle the user step to pick discovered device."""
-        if user_input is not None:
-            address = user_input[CONF_ADDRESS]
-            await self.async_set_unique_id(address, raise_on_progress=False)
-            self._abort_if_unique_id_configured()
-            return self.async_create_entry(
-                title=self._discovered_devices[address], data={}
+        """Handle the user step to pick discovered devices."""
+        if user_input is not None and CONF_ADDRESS in user_input:
+            # A further monitor selected in the user step of another flow
+            await self.async_set_unique_id(
+                user_input[CONF_ADDRESS], raise_on_progress=False
             )
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(title=user_input[CONF_NAME], data={})
+
+        errors: dict[str, str] = {}
+        placeholders: dict[str, str] = {}
+        if user_input is not None:
+            addresses = user_input[CONF_ADDRESSES]
+            if addresses:
+                address, *other_addresses = addresses
+                failed = [
+                    self._discovered_devices[other_address]
+                    for other_address in other_addresses
+                    if not await self._async_add_selected_device(other_address)
+                ]
+                if not failed:
+                    await self.async_set_unique_id(address, raise_on_progress=False)
+                    self._abort_if_unique_id_configured()
+                    return self.async_create_entry(
+                        title=self._discovered_devices[address], data={}
+                    )
+                errors["base"] = "add_failed"
+                placeholders["devices"] = ", ".join(failed)
+            else:
+                errors["base"] = "no_selection"
 
         current_addresses = self._async_current_ids()
+        now = time.monotonic()
+        candidates: list[BluetoothServiceInfoBleak] = []
         for discovery_info in async_discovered_service_info(self.hass, False):
-            _LOGGER.debug(f"discovery_info: {discovery_info}")
-            _LOGGER.debug(f"manufacturer_data: {discovery_info.manufacturer_data}")
+            # Cheap checks first, a ward can have hundreds of other devices
+            if MFR_ID not in discovery_info.manufacturer_data:
+                continue
             address = discovery_info.address
             if address in current_addresses or address in self._discovered_devices:
                 continue
-            device = EtekcityBPDevice()
-            if device.supported(discovery_info):
-                self._discovered_devices[address] = (
-                # device.title or device.get_device_name() or discovery_info.name
-                discovery_info.name
+            candidates.append(discovery_info)
+
+        for discovery_info in sorted(candidates, key=lambda info: info.rssi, reverse=True):
+            address = discovery_info.address
+            self._discovered_devices[address] = discovery_info.name
+            self._device_labels[address] = (
+                f"{discovery_info.name} ({address}), {discovery_info.rssi} dBm, "
+                f"seen {max(0, round(now - discovery_info.time))} s ago"
             )
 
         if not self._discovered_devices:
@@ -97,6 +171,39 @@ class EtekcityBPConfigFlow(ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema(
-                {vol.Required(CONF_ADDRESS): vol.In(self._discovered_devices)}
+                {
+                    vol.Required(CONF_ADDRESSES, default=[]): cv.multi_select(
+                        self._device_labels
+                    )
+                }
             ),
-        )
\ No newline at end of file
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+
+
+class EtekcityBPOptionsFlow(OptionsFlow):
+    """Handle EtekcityBP options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        schema: dict[vol.Marker, Any] = {
+            vol.Optional(CONF_TRACE, default=False): bool,
+            vol.Optional(CONF_DEVICE_COMMANDS, default=False): bool,
+        }
+        for conf_person in CONF_PERSONS:
+            schema[vol.Optional(conf_person)] = EntitySelector(
+                EntitySelectorConfig(domain="person")
+            )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema(schema), self.config_entry.options
+            ),
+        )
@@ -6,11 +6,63 @@ MANUFACTURER = "Etekcity"
 HW_REVISION_STRING_CHARACTERISTIC_UUID = "00002A27-0000-1000-8000-00805f9b34fb"
 SW_REVISION_STRING_CHARACTERISTIC_UUID = "00002A28-0000-1000-8000-00805f9b34fb"
 CHARACTERISTIC_BLOOD_PRESSURE = "0000fff1-0000-1000-8000-00805f9b34fb"
+CHARACTERISTIC_COMMAND = "0000fff2-0000-1000-8000-00805f9b34fb"
 CLIENT_CHARACTERISTIC_CONFIG = "00002902-0000-1000-8000-00805f9b34fb"
 CLIENT_CHARACTERISTIC_CONFIG_HANDLE = 14
 CLIENT_CHARACTERISTIC_CONFIG_DATA = b"\x01\x00"
 MFR_ID = 1744
 UPDATE_INTERVAL = 10
+RETRY_DELAY = 20
+RETRY_DELAY_IN_WINDOW = 5
+CONF_TRACE = "trace"
+CONF_DEVICE_COMMANDS = "device_commands"
+CONF_PERSONS = ["person_user1", "person_user2"]
 BPM = "bpm"
+# Exports are written below this directory of the configuration directory
+EXPORT_DIRECTORY = f"{DOMAIN}_exports"
 HW_VERSION_KEY = "hw_version"
-SW_VERSION_KEY = "sw_version"
\ No newline at end of file
+SW_VERSION_KEY = "sw_version"
+
+# Command frames written to CHARACTERISTIC_COMMAND use the same framing as the
+# notifications: header, group, opcode, payload length, 0x00, payload, checksum.
+# The opcodes and the checksum are not confirmed, so commands are only written
+# once CONF_DEVICE_COMMANDS is enabled in the options.
+COMMAND_HEADER = 0xA5
+COMMAND_GROUP = 0x02
+COMMAND_SET_DISPLAY_UNITS = 0x01
+COMMAND_SYNC_TIME = 0x03
+COMMAND_REQUEST_HISTORY = 0x04
+
+DISPLAY_UNITS_MMHG = "mmHg"
+DISPLAY_UNITS_KPA = "kPa"
+USERS = 2
+
+# Plausible ranges of decoded values, frames outside them are rejected
+SYSTOLIC_RANGE = range(40, 300)
+DIASTOLIC_RANGE = range(20, 200)
+PULSE_RANGE = range(30, 250)
+QUARANTINE_SIZE = 32
+
+BP_CATEGORY_NORMAL = "normal"
+BP_CATEGORY_ELEVATED = "elevated"
+BP_CATEGORY_STAGE_1 = "hypertension_stage_1"
+BP_CATEGORY_STAGE_2 = "hypertension_stage_2"
+BP_CATEGORY_CRISIS = "hypertensive_crisis"
+BP_CATEGORIES = [
+    BP_CATEGORY_NORMAL,
+    BP_CATEGORY_ELEVATED,
+    BP_CATEGORY_STAGE_1,
+    BP_CATEGORY_STAGE_2,
+    BP_CATEGORY_CRISIS,
+]
+
+READING_QUALITY_GOOD = "good"
+READING_QUALITY_MOTION = "motion"
+READING_QUALITY_IRREGULAR_HEARTBEAT = "irregular_heartbeat"
+READING_QUALITY_MOTION_IRREGULAR_HEARTBEAT = "motion_irregular_heartbeat"
+READING_QUALITIES = [
+    READING_QUALITY_GOOD,
+    READING_QUALITY_MOTION,
+    READING_QUALITY_IRREGULAR_HEARTBEAT,
+    READING_QUALITY_MOTION_IRREGULAR_HEARTBEAT,
+]
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 
 from bleak import BleakClient
+from bleak_retry_connector import close_stale_connections_by_address
 
 from typing import TYPE_CHECKING
 
@@ -18,16 +20,23 @@ from homeassistant.components.bluetooth.passive_update_processor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import CoreState, HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.util import dt as dt_util
 
 from .const import (
     CHARACTERISTIC_BLOOD_PRESSURE,
+    CHARACTERISTIC_COMMAND,
     CLIENT_CHARACTERISTIC_CONFIG_HANDLE,
     CLIENT_CHARACTERISTIC_CONFIG_DATA,
+    COMMAND_REQUEST_HISTORY,
     HW_REVISION_STRING_CHARACTERISTIC_UUID,
+    RETRY_DELAY,
+    RETRY_DELAY_IN_WINDOW,
     SW_REVISION_STRING_CHARACTERISTIC_UUID,
 )
-from .device import EtekcityBPDevice
+from .device import EtekcityBPDevice, build_queued_command
+from .history import EtekcityBPHistory
+from .predictor import EtekcityBPSchedulePredictor
+from .trace import NULL_TRACE_CYCLE, EtekcityBPTracer
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -47,9 +56,13 @@ class EtekcityBPCoordinator(
         logger: logging.Logger,
         address: str,
         device: EtekcityBPDevice,
+        history: EtekcityBPHistory,
+        predictor: EtekcityBPSchedulePredictor,
         base_unique_id: str,
         device_name: str,
         connectable: bool,
+        tracer: EtekcityBPTracer | None = None,
+        commands_enabled: bool = False,
     ) -> None:
         """Initialize data coordinator."""
         super().__init__(
@@ -59,18 +72,41 @@ class EtekcityBPCoordinator(
             mode=bluetooth.BluetoothScanningMode.ACTIVE,
             update_method=self._update_method,
             needs_poll_method=self._needs_poll,
-            poll_method=self._async_update,
+            poll_method=self._async_poll_device,
             connectable=connectable,
         )
         self.address = address
         self.device = device
+        self.history = history
+        self.predictor = predictor
         self.device_name = device_name
         self.base_unique_id = base_unique_id
+        self.commands_enabled = commands_enabled
+        # Queued commands by opcode and user slot, with their argument
+        self._commands: dict[tuple[int, int | None], str | None] = {}
+        # Set once request_history is written in a connection window. The
+        # replies are not understood yet, so the notifications of that window
+        # are not decoded: they would be committed as readings taken now.
+        self._history_requested = False
+        self._tracer = tracer
+        self._trace_cycle = NULL_TRACE_CYCLE
+        self._poll_requested_at: float | None = None
+        self._polling = False
+        self._woke_at: float | None = None
+        # A device already present at setup woke up before we could time it
+        self._awake = self._available
+        self._stale_connections_closed = asyncio.Event()
+        self._unregister_measurement_callbacks = [
+            device.register_measurement_callback(history.async_add),
+            device.register_measurement_callback(predictor.async_record),
+        ]
 
-        _LOGGER.debug(f"Scanner count: {bluetooth.async_scanner_count(hass, connectable=True)}")
-        if bluetooth.async_scanner_count(hass, connectable=True) < 1:
-            _LOGGER.error("No Bluetooth scanner available, cannot start coordinator")
-            raise ConfigEntryNotReady("No Bluetooth scanner available")
+    async def async_close_stale_connections(self) -> None:
+        """Close connections to the device left open by a previous run."""
+        try:
+            await close_stale_connections_by_address(self.address)
+        finally:
+            self._stale_connections_closed.set()
 
     @callback
     def _needs_poll(
@@ -79,7 +115,8 @@ class EtekcityBPCoordinator(
         seconds_since_last_poll: float | None,
     ) -> bool:
         # Only poll if hass is running, we need to poll,
-        # and we actually have a way to connect to the device
+        # and we actually have a way to connect to the device.
+        # Until a connectable scanner has registered there is none.
         needs_poll = (
             self.hass.state == CoreState.running
             and self.device.poll_needed(seconds_since_last_poll)
@@ -89,6 +126,14 @@ class EtekcityBPCoordinator(
                 )
             )
         )
+        # Only the wait for a poll that is not already running is traced
+        if (
+            needs_poll
+            and self._tracer
+            and not self._polling
+            and self._poll_requested_at is None
+        ):
+            self._poll_requested_at = time.monotonic()
         return needs_poll
 
     def _update_method(self, service_info) -> PassiveBluetoothDataUpdate:
@@ -97,18 +142,38 @@ class EtekcityBPCoordinator(
         # It can be used to update the device state or perform other actions.
         _LOGGER.info("Device %s is now available", self.device_name)
 
+    async def _async_poll_device(
+        self, service_info: bluetooth.BluetoothServiceInfoBleak
+    ) -> None:
+        """Poll the device, flagging the poll loop as running while it lasts."""
+        self._polling = True
+        try:
+            await self._async_update(service_info)
+        finally:
+            self._polling = False
+
     async def _async_update(
         self, service_info: bluetooth.BluetoothServiceInfoBleak
     ) -> None:
         """Poll the device."""
+        await self._stale_connections_closed.wait()
         while self._available:
+            if self._tracer:
+                self._trace_cycle = self._tracer.start_cycle()
+                if self._poll_requested_at is not None:
+                    self._trace_cycle.phase("wait_for_poll", self._poll_requested_at)
+                    self._poll_requested_at = None
+            trace_cycle = self._trace_cycle
+            self._history_requested = False
             try:
                 _LOGGER.debug(f"Connecting to device {service_info.device.address}")
+                trace_cycle.phase("connect")
                 async with BleakClient(service_info.device) as client:
                     if (not client.is_connected):
                         raise "client not connected"
 
                     # Get Hardware and Firmware version
+                    trace_cycle.phase("read_versions")
                     try:
                         if not self.device.data.hw_version:
                             _LOGGER.debug("Reading hardware version")
@@ -132,23 +197,84 @@ class EtekcityBPCoordinator(
 
                     # Enable notifications to get BP values
                     _LOGGER.debug ("Starting notifications")
+                    trace_cycle.phase("start_notify")
                     await client.start_notify(CHARACTERISTIC_BLOOD_PRESSURE, self._notification_handler)
                     await client.write_gatt_descriptor(CLIENT_CHARACTERISTIC_CONFIG_HANDLE, CLIENT_CHARACTERISTIC_CONFIG_DATA)
+                    trace_cycle.phase("write_commands")
+                    await self._async_send_commands(client)
+                    trace_cycle.phase("notification_window")
                     await asyncio.sleep(4)
 
                     _LOGGER.debug ("Pausing notification processing")
+                    trace_cycle.phase("stop_notify")
                     async with asyncio.timeout(10):
                         await client.stop_notify(CHARACTERISTIC_BLOOD_PRESSURE)
+                    trace_cycle.phase("settle")
                     await asyncio.sleep(1)
             except Exception as e:
                 _LOGGER.debug(f"Error {e}; Long pausing notification processing")
-                await asyncio.sleep(20)
+                trace_cycle.error(e)
+                trace_cycle.phase("error_sleep")
+                await asyncio.sleep(self._retry_delay())
+            finally:
+                if self._tracer:
+                    self._tracer.finish_cycle(trace_cycle)
+                    self._trace_cycle = NULL_TRACE_CYCLE
+
+    def _retry_delay(self) -> float:
+        """Return how long to wait before connecting again after an error.
+
+        Polling only runs while the device advertises, so it is awake and an
+        off-schedule measurement may be under way. The schedule only shortens
+        the delay, inside a predicted window.
+        """
+        if self.predictor.in_window(dt_util.now()):
+            return RETRY_DELAY_IN_WINDOW
+        return RETRY_DELAY
+
+    @callback
+    def async_queue_command(
+        self, opcode: int, user: int | None = None, argument: str | None = None
+    ) -> None:
+        """Queue a command to be written in the next connection window.
+
+        A command replaces a queued one with the same opcode and user slot, so
+        repeated calls do not pile up. The frame is built when it is written,
+        so a clock synchronisation carries the time of the connection.
+        """
+        _LOGGER.debug(f"Queueing command: {opcode:#04x} user {user} {argument}")
+        self._commands.pop((opcode, user), None)
+        self._commands[(opcode, user)] = argument
+
+    async def _async_send_commands(self, client: BleakClient) -> None:
+        """Write all queued commands over the open connection."""
+        while self._commands:
+            opcode, user = key = next(iter(self._commands))
+            argument = self._commands.pop(key)
+            command = build_queued_command(opcode, user, argument, dt_util.now())
+            _LOGGER.debug(f"Writing command: {command.hex()}")
+            try:
+                await client.write_gatt_char(CHARACTERISTIC_COMMAND, command, response=True)
+            except Exception:
+                # Keep the command for the next connection window
+                self._commands.setdefault(key, argument)
+                raise
+            if opcode == COMMAND_REQUEST_HISTORY:
+                self._history_requested = True
 
     @callback
     async def _notification_handler(self, handle, data):
         """Handle notifications from the device."""
-        _LOGGER.debug(f"Notification - Handle: {handle}, Data: {data.hex()}")
+        self._trace_cycle.frame(data)
+        if self._woke_at is not None:
+            self.predictor.async_record_latency(time.monotonic() - self._woke_at)
+            self._woke_at = None
 
+        if self._history_requested:
+            # Logged differently, so import_log does not pick them up either
+            _LOGGER.debug(f"History reply - Handle: {handle}, Data: {data.hex()}")
+            return
+        _LOGGER.debug(f"Notification - Handle: {handle}, Data: {data.hex()}")
         await self.device.update(data)
 
     @callback
@@ -158,6 +284,8 @@ class EtekcityBPCoordinator(
         """Handle the device going unavailable."""
         super()._async_handle_unavailable(service_info)
         _LOGGER.info("Device %s is unavailable", self.device_name)
+        self._awake = False
+        self._woke_at = None
 
 
     @callback
@@ -179,7 +307,17 @@ class EtekcityBPCoordinator(
         ):
             return
 
+        if not self._awake:
+            self._awake = True
+            self._woke_at = service_info.time
+
     async def async_unload_entry(self) -> bool:
         """Unload a config entry."""
         self._available = False
+        for unregister_measurement_callback in self._unregister_measurement_callbacks:
+            unregister_measurement_callback()
+        await self.history.async_save()
+        await self.predictor.async_save()
+        if self._tracer:
+            await self._tracer.async_close()
         return True
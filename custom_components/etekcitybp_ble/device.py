@@ -1,20 +1,119 @@
 """The EtekcityBP device."""
 
 from __future__ import annotations
-from dataclasses import dataclass
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
 
 import logging
+import time
 
 from collections.abc import Callable
+from datetime import datetime
 from typing import Any
 
 from bleak.backends.device import BLEDevice
 from bleak.backends.scanner import AdvertisementData
 
-from .const import MFR_ID
+from .const import (
+    BP_CATEGORY_CRISIS,
+    BP_CATEGORY_ELEVATED,
+    BP_CATEGORY_NORMAL,
+    BP_CATEGORY_STAGE_1,
+    BP_CATEGORY_STAGE_2,
+    COMMAND_GROUP,
+    COMMAND_HEADER,
+    COMMAND_REQUEST_HISTORY,
+    COMMAND_SET_DISPLAY_UNITS,
+    COMMAND_SYNC_TIME,
+    DIASTOLIC_RANGE,
+    DISPLAY_UNITS_KPA,
+    MFR_ID,
+    PULSE_RANGE,
+    QUARANTINE_SIZE,
+    READING_QUALITY_GOOD,
+    READING_QUALITY_IRREGULAR_HEARTBEAT,
+    READING_QUALITY_MOTION,
+    READING_QUALITY_MOTION_IRREGULAR_HEARTBEAT,
+    SYSTOLIC_RANGE,
+    USERS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+HEADER_DISPLAY_UNITS = 0xa502010700
+HEADER_MEASUREMENT = 0xa522021300
+HEADER_ERROR = 0xa522020a00
+
+# A measurement does not fit in one notification, its last 5 bytes
+# (pulse, flags and the trailing checksum) follow in a continuation frame.
+MEASUREMENT_FRAME_LENGTH = 20
+CONTINUATION_FRAME_LENGTH = 5
+
+# Valid frames the decoder does not know, such as acknowledgements, are not
+# rejected: they are counted apart and do not drop a pending measurement.
+UNKNOWN_FRAME = "unknown_frame"
+
+
+def bp_category(systolic: int, diastolic: int) -> str:
+    """Return the AHA blood pressure category of a reading."""
+    if systolic > 180 or diastolic > 120:
+        return BP_CATEGORY_CRISIS
+    if systolic >= 140 or diastolic >= 90:
+        return BP_CATEGORY_STAGE_2
+    if systolic >= 130 or diastolic >= 80:
+        return BP_CATEGORY_STAGE_1
+    if systolic >= 120:
+        return BP_CATEGORY_ELEVATED
+    return BP_CATEGORY_NORMAL
+
+
+def reading_quality(motion_indicator: bool, irregular_heartbeat: bool) -> str:
+    """Return the quality of a reading from its indicator bits."""
+    if motion_indicator and irregular_heartbeat:
+        return READING_QUALITY_MOTION_IRREGULAR_HEARTBEAT
+    if motion_indicator:
+        return READING_QUALITY_MOTION
+    if irregular_heartbeat:
+        return READING_QUALITY_IRREGULAR_HEARTBEAT
+    return READING_QUALITY_GOOD
+
+
+def build_command(opcode: int, payload: bytes) -> bytes:
+    """Build a command frame for the device."""
+    frame = bytes([COMMAND_HEADER, COMMAND_GROUP, opcode, len(payload), 0x00]) + payload
+    return frame + bytes([sum(frame[1:]) & 0xFF])
+
+
+def build_set_display_units_command(units: str) -> bytes:
+    """Build a command to set the display units of the device."""
+    return build_command(
+        COMMAND_SET_DISPLAY_UNITS, bytes([0x01 if units == DISPLAY_UNITS_KPA else 0x00])
+    )
+
+
+def build_sync_time_command(now: datetime) -> bytes:
+    """Build a command to set the device clock."""
+    return build_command(
+        COMMAND_SYNC_TIME,
+        bytes([now.year - 2000, now.month, now.day, now.hour, now.minute, now.second]),
+    )
+
+
+def build_request_history_command(user: int) -> bytes:
+    """Build a command to request the stored records of a user slot."""
+    return build_command(COMMAND_REQUEST_HISTORY, bytes([user]))
+
+
+def build_queued_command(
+    opcode: int, user: int | None, argument: str | None, now: datetime
+) -> bytes:
+    """Build a queued command just before it is written."""
+    if opcode == COMMAND_SET_DISPLAY_UNITS:
+        return build_set_display_units_command(argument)
+    if opcode == COMMAND_SYNC_TIME:
+        return build_sync_time_command(now)
+    return build_request_history_command(user)
+
 
 @dataclass
 class EtekcityBPData:
@@ -31,6 +130,37 @@ class EtekcityBPData:
     sw_version: str | None = None
 
 
+@dataclass(slots=True)
+class EtekcityBPRejectedFrame:
+    """A notification frame that failed validation or was not recognised."""
+
+    timestamp: float
+    data: str
+    reason: str
+
+
+@dataclass(slots=True)
+class EtekcityBPMeasurement:
+    """A complete EtekcityBP measurement."""
+
+    timestamp: float
+    user: int
+    systolic: int
+    diastolic: int
+    pulse: int
+    irregular_heartbeat: bool
+    motion_indicator: bool
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the measurement as a dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EtekcityBPMeasurement:
+        """Create a measurement from a dictionary."""
+        return cls(**data)
+
+
 class EtekcityBPDevice():
 
     def __init__(
@@ -45,6 +175,10 @@ class EtekcityBPDevice():
                 "pulse0": None, 
                 "irregular_heartbeat0": None,
                 "motion_indicator0": None,
+                "bp_category0": None,
+                "pulse_pressure0": None,
+                "mean_arterial_pressure0": None,
+                "reading_quality0": None,
                 "systolic1": None, 
                 "diastolic1": None, 
                 "systolickpa1": None, 
@@ -52,12 +186,24 @@ class EtekcityBPDevice():
                 "pulse1": None,
                 "irregular_heartbeat1": None,
                 "motion_indicator1": None,
+                "bp_category1": None,
+                "pulse_pressure1": None,
+                "mean_arterial_pressure1": None,
+                "reading_quality1": None,
                 "display_units": "mmHg",
                 "error_code": "OK",
                 }
             )
         self._callbacks: list[Callable[[], None]] = []
+        self._measurement_callbacks: list[Callable[[EtekcityBPMeasurement], None]] = []
         self._user = None
+        self._pending: tuple[float, int, int] | None = None
+        self.rejected_frames: Counter[str] = Counter()
+        self.quarantine: deque[EtekcityBPRejectedFrame] = deque(maxlen=QUARANTINE_SIZE)
+        self.unknown_frames = 0
+        self.last_unknown_frames: deque[EtekcityBPRejectedFrame] = deque(
+            maxlen=QUARANTINE_SIZE
+        )
 
     def poll_needed(self, seconds_since_last_poll: float | None) -> bool:
         """Return if device needs polling."""
@@ -85,25 +231,148 @@ class EtekcityBPDevice():
 
     async def update(self, data: bytes):
         """Update values from notification packet."""
+        self.process_frame(data, time.time())
+
+    def process_frame(self, data: bytes, timestamp: float) -> None:
+        """Decode a notification packet received at timestamp."""
+        if (reason := self.validate_frame(data)) == UNKNOWN_FRAME:
+            self._skip(data, timestamp)
+            return
+        if reason:
+            self._reject(data, timestamp, reason)
+            return
+
         header = int.from_bytes(data[0:5], "big")
-        if header == 0xa502010700 and len(data) == 13:
+        if header == HEADER_DISPLAY_UNITS:
             self.update_value("display_units", "kPa" if data[10] == 0x01 else "mmHg")
-        elif header == 0xa522021300 and len(data) == 20:
+        elif header == HEADER_MEASUREMENT:
             self._user = data[14]
             self.update_value(f"systolic{self._user}", data[15])
             self.update_value(f"diastolic{self._user}", data[17])
             self.update_value(f"systolickpa{self._user}", data[15] * 0.13332)
             self.update_value(f"diastolickpa{self._user}", data[17] * 0.13332)
             self.update_value("error_code", "OK")
-        elif data[0] == 0x00 and len(data) == 5:
-            self.update_value(f"pulse{self._user}", data[1])
-            self.update_value(f"motion_indicator{self._user}", True if data[3] & 0x01 else False)
-            self.update_value(f"irregular_heartbeat{self._user}", True if data[3] == 0x04 else False)
-        elif header == 0xa522020a00 and len(data) == 16:
+            self._pending = (timestamp, data[15], data[17])
+        elif header == HEADER_ERROR:
+            self._pending = None
             self.update_value("error_code", f"E{str(data[15] + 1).zfill(2)}")
+            if self._user is None:
+                return
             self.update_value(f"systolic{self._user}", None)
             self.update_value(f"diastolic{self._user}", None)
             self.update_value(f"pulse{self._user}", None)
+            self.update_value(f"bp_category{self._user}", None)
+            self.update_value(f"pulse_pressure{self._user}", None)
+            self.update_value(f"mean_arterial_pressure{self._user}", None)
+            self.update_value(f"reading_quality{self._user}", None)
+        else:
+            motion_indicator = True if data[3] & 0x01 else False
+            irregular_heartbeat = True if data[3] & 0x04 else False
+            self.update_value(f"pulse{self._user}", data[1])
+            self.update_value(f"motion_indicator{self._user}", motion_indicator)
+            self.update_value(f"irregular_heartbeat{self._user}", irregular_heartbeat)
+            if self._pending is not None:
+                measured_at, systolic, diastolic = self._pending
+                self._pending = None
+                self._commit(
+                    EtekcityBPMeasurement(
+                        measured_at,
+                        self._user,
+                        systolic,
+                        diastolic,
+                        data[1],
+                        irregular_heartbeat,
+                        motion_indicator,
+                    )
+                )
+
+    def validate_frame(self, data: bytes) -> str | None:
+        """Return why a notification packet is rejected, None if it is valid.
+
+        Besides the value ranges, the payload length declared in the header
+        must match the frame. The trailing checksum byte is not verified as
+        its algorithm is not known.
+        """
+        length = len(data)
+        if length == CONTINUATION_FRAME_LENGTH and data[0] == 0x00:
+            if self._pending is None:
+                return "continuation_without_measurement"
+            if data[1] not in PULSE_RANGE:
+                return "pulse_out_of_range"
+            return None
+        if length < 6:
+            return UNKNOWN_FRAME
+
+        header = int.from_bytes(data[0:5], "big")
+        if header == HEADER_MEASUREMENT:
+            if length != MEASUREMENT_FRAME_LENGTH:
+                return "bad_length"
+            if data[14] >= USERS:
+                return "user_out_of_range"
+            if data[15] not in SYSTOLIC_RANGE:
+                return "systolic_out_of_range"
+            if data[17] not in DIASTOLIC_RANGE or data[17] >= data[15]:
+                return "diastolic_out_of_range"
+            return None
+        if header == HEADER_DISPLAY_UNITS:
+            if length != data[3] + 6:
+                return "bad_length"
+            if data[10] > 0x01:
+                return "display_units_out_of_range"
+            return None
+        if header == HEADER_ERROR:
+            if length != data[3] + 6:
+                return "bad_length"
+            return None
+        return UNKNOWN_FRAME
+
+    def _reject(self, data: bytes, timestamp: float, reason: str) -> None:
+        """Quarantine a notification packet that failed validation.
+
+        A pending measurement is dropped, so a later continuation frame cannot
+        complete it with the values of another reading.
+        """
+        _LOGGER.debug(f"Rejected frame ({reason}): {data.hex()}")
+        self._pending = None
+        self.rejected_frames[reason] += 1
+        self.quarantine.append(EtekcityBPRejectedFrame(timestamp, data.hex(), reason))
+
+    def _skip(self, data: bytes, timestamp: float) -> None:
+        """Count a notification packet of a type the decoder does not know."""
+        _LOGGER.debug(f"Skipped unknown frame: {data.hex()}")
+        self.unknown_frames += 1
+        self.last_unknown_frames.append(
+            EtekcityBPRejectedFrame(timestamp, data.hex(), UNKNOWN_FRAME)
+        )
+
+    def _commit(self, measurement: EtekcityBPMeasurement) -> None:
+        """Publish a complete measurement and its derived values."""
+        _LOGGER.debug(f"Measurement committed: {measurement}")
+        user = measurement.user
+        systolic = measurement.systolic
+        diastolic = measurement.diastolic
+        self.update_value(f"bp_category{user}", bp_category(systolic, diastolic))
+        self.update_value(f"pulse_pressure{user}", systolic - diastolic)
+        self.update_value(
+            f"mean_arterial_pressure{user}", round(diastolic + (systolic - diastolic) / 3, 1)
+        )
+        self.update_value(
+            f"reading_quality{user}",
+            reading_quality(measurement.motion_indicator, measurement.irregular_heartbeat),
+        )
+        for measurement_callback in self._measurement_callbacks:
+            measurement_callback(measurement)
+
+    def register_measurement_callback(
+        self, measurement_callback: Callable[[EtekcityBPMeasurement], None]
+    ) -> Callable[[], None]:
+        """Register a callback for complete measurements."""
+        self._measurement_callbacks.append(measurement_callback)
+
+        def _unregister() -> None:
+            self._measurement_callbacks.remove(measurement_callback)
+
+        return _unregister
 
     def update_value(self, parameter: str, value: int):
         """Update single value."""
@@ -0,0 +1,25 @@
+"""Diagnostics support for EtekcityBP."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .coordinator import EtekcityConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: EtekcityConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    device = entry.runtime_data.device
+    return {
+        "hw_version": device.data.hw_version,
+        "sw_version": device.data.sw_version,
+        "rejected_frames": dict(device.rejected_frames),
+        "quarantine": [asdict(frame) for frame in device.quarantine],
+        "unknown_frames": device.unknown_frames,
+        "last_unknown_frames": [asdict(frame) for frame in device.last_unknown_frames],
+    }
@@ -0,0 +1,138 @@
+"""Streaming export of EtekcityBP measurement history."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from datetime import UTC, datetime
+import json
+import logging
+import os
+from typing import Any
+
+from .device import EtekcityBPMeasurement
+
+_LOGGER = logging.getLogger(__name__)
+
+FORMAT_CSV = "csv"
+FORMAT_FHIR = "fhir"
+EXPORT_FORMATS = [FORMAT_CSV, FORMAT_FHIR]
+CHUNK_SIZE = 500
+
+CSV_HEADER = (
+    "timestamp,user,systolic,diastolic,pulse,irregular_heartbeat,motion_indicator\n"
+)
+
+LOINC = "http://loinc.org"
+UCUM = "http://unitsofmeasure.org"
+
+
+def _isoformat(timestamp: float) -> str:
+    """Return a timestamp in ISO 8601 format."""
+    return datetime.fromtimestamp(timestamp, UTC).isoformat()
+
+
+def _chunks(
+    measurements: Sequence[EtekcityBPMeasurement], chunk_size: int
+) -> Iterator[Sequence[EtekcityBPMeasurement]]:
+    """Yield the measurements in chunks."""
+    for start in range(0, len(measurements), chunk_size):
+        yield measurements[start : start + chunk_size]
+
+
+def csv_chunks(
+    measurements: Sequence[EtekcityBPMeasurement], chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """Yield CSV rows of the measurements, one string per chunk."""
+    for chunk in _chunks(measurements, chunk_size):
+        yield "".join(
+            f"{_isoformat(measurement.timestamp)},{measurement.user + 1},"
+            f"{measurement.systolic},{measurement.diastolic},{measurement.pulse},"
+            f"{str(measurement.irregular_heartbeat).lower()},"
+            f"{str(measurement.motion_indicator).lower()}\n"
+            for measurement in chunk
+        )
+
+
+def _component(code: str, display: str, value: int, unit: str, ucum: str) -> dict[str, Any]:
+    """Return an Observation component."""
+    return {
+        "code": {"coding": [{"system": LOINC, "code": code, "display": display}]},
+        "valueQuantity": {"value": value, "unit": unit, "system": UCUM, "code": ucum},
+    }
+
+
+def fhir_observation(
+    measurement: EtekcityBPMeasurement, device_name: str
+) -> dict[str, Any]:
+    """Return a FHIR blood pressure panel Observation for a measurement."""
+    return {
+        "resourceType": "Observation",
+        "status": "final",
+        "category": [
+            {
+                "coding": [
+                    {
+                        "system": "http://terminology.hl7.org/CodeSystem/observation-category",
+                        "code": "vital-signs",
+                    }
+                ]
+            }
+        ],
+        "code": {
+            "coding": [
+                {
+                    "system": LOINC,
+                    "code": "85354-9",
+                    "display": "Blood pressure panel with all children optional",
+                }
+            ]
+        },
+        "effectiveDateTime": _isoformat(measurement.timestamp),
+        "device": {"display": f"{device_name} user {measurement.user + 1}"},
+        "component": [
+            _component("8480-6", "Systolic blood pressure", measurement.systolic, "mmHg", "mm[Hg]"),
+            _component("8462-4", "Diastolic blood pressure", measurement.diastolic, "mmHg", "mm[Hg]"),
+            _component("8867-4", "Heart rate", measurement.pulse, "beats/minute", "/min"),
+        ],
+    }
+
+
+def fhir_chunks(
+    measurements: Sequence[EtekcityBPMeasurement],
+    device_name: str,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """Yield one FHIR collection Bundle per chunk as an NDJSON line."""
+    for chunk in _chunks(measurements, chunk_size):
+        bundle = {
+            "resourceType": "Bundle",
+            "type": "collection",
+            "entry": [
+                {"resource": fhir_observation(measurement, device_name)}
+                for measurement in chunk
+            ],
+        }
+        yield json.dumps(bundle, separators=(",", ":")) + "\n"
+
+
+def write_export(
+    path: str,
+    measurements: Sequence[EtekcityBPMeasurement],
+    export_format: str,
+    device_name: str,
+    append: bool,
+) -> int:
+    """Write measurements to an export file chunk by chunk, return the count."""
+    new_file = not append or not os.path.exists(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w" if new_file else "a", encoding="utf-8") as export:
+        if export_format == FORMAT_CSV:
+            if new_file:
+                export.write(CSV_HEADER)
+            chunks = csv_chunks(measurements)
+        else:
+            chunks = fhir_chunks(measurements, device_name)
+        for chunk in chunks:
+            export.write(chunk)
+    _LOGGER.debug(f"Exported {len(measurements)} measurements to {path}")
+    return len(measurements)
@@ -0,0 +1,275 @@
+"""Measurement history of an EtekcityBP device."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator
+import heapq
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, USERS
+from .device import EtekcityBPMeasurement
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# Readings of the same user with the same values this close together are
+# the same measurement seen twice, e.g. live and from an imported log.
+DUPLICATE_WINDOW = 60
+
+
+def _same_reading(known: EtekcityBPMeasurement, measurement: EtekcityBPMeasurement) -> bool:
+    """Return if two measurements of a user have the same values."""
+    return (
+        known.systolic == measurement.systolic
+        and known.diastolic == measurement.diastolic
+        and known.pulse == measurement.pulse
+    )
+
+
+def _recent(
+    measurements: list[EtekcityBPMeasurement], since: float
+) -> Iterator[EtekcityBPMeasurement]:
+    """Yield the measurements of a time-ordered list taken since a time, latest first."""
+    for measurement in reversed(measurements):
+        if measurement.timestamp < since:
+            return
+        yield measurement
+
+
+class EtekcityBPHistory:
+    """Time-ordered measurements of a device, persisted per config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the history."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.history.{entry_id}"
+        )
+        self._measurements: dict[int, list[EtekcityBPMeasurement]] = {
+            user: [] for user in range(USERS)
+        }
+        # Time index, the timestamps of _measurements in the same order
+        self._timestamps: dict[int, list[float]] = {user: [] for user in range(USERS)}
+        # Insertion order, the sequence numbers of _measurements in the same order
+        self._sequences: dict[int, list[int]] = {user: [] for user in range(USERS)}
+        self.last_sequence = 0
+        self._export_cursors: dict[str, int] = {}
+        self._listeners: list[Callable[[list[EtekcityBPMeasurement]], None]] = []
+
+    async def async_load(self) -> None:
+        """Load the history from storage."""
+        if not (data := await self._store.async_load()):
+            return
+        items = data.get("measurements", [])
+        if "last_sequence" not in data:
+            # Stored before sequence numbers, number the measurements in time
+            # order so the timestamp cursors map to the same measurements.
+            items.sort(key=lambda item: item["timestamp"])
+            for sequence, item in enumerate(items, 1):
+                item["sequence"] = sequence
+            timestamps = [item["timestamp"] for item in items]
+            data["export_cursors"] = {
+                name: bisect_right(timestamps, timestamp)
+                for name, timestamp in data.get("export_cursors", {}).items()
+            }
+            data["last_sequence"] = len(items)
+
+        entries: dict[int, list[tuple[EtekcityBPMeasurement, int]]] = {}
+        for item in items:
+            sequence = item.pop("sequence")
+            measurement = EtekcityBPMeasurement.from_dict(item)
+            entries.setdefault(measurement.user, []).append((measurement, sequence))
+        for user, user_entries in entries.items():
+            user_entries.sort(key=lambda entry: entry[0].timestamp)
+            self._measurements[user] = [measurement for measurement, _ in user_entries]
+            self._timestamps[user] = [measurement.timestamp for measurement, _ in user_entries]
+            self._sequences[user] = [sequence for _, sequence in user_entries]
+        self.last_sequence = data["last_sequence"]
+        self._export_cursors = data.get("export_cursors", {})
+
+    async def async_save(self) -> None:
+        """Write the history to storage now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the stored history."""
+        await self._store.async_remove()
+
+    def measurements(self, user: int) -> list[EtekcityBPMeasurement]:
+        """Return the time-ordered measurements of a user slot."""
+        return self._measurements.get(user, [])
+
+    def measurements_since(
+        self, user: int, sequence: int | None
+    ) -> list[EtekcityBPMeasurement]:
+        """Return the time-ordered measurements of a user slot added after sequence.
+
+        Measurements are numbered in the order they are added, so a reading
+        added late with an older timestamp, e.g. from an imported log, is still
+        found after a cursor.
+        """
+        measurements = self.measurements(user)
+        if sequence is None:
+            return list(measurements)
+        return [
+            measurement
+            for measurement, added in zip(measurements, self._sequences.get(user, []))
+            if added > sequence
+        ]
+
+    def cursor(self, user: int, index: int) -> tuple[float, int]:
+        """Return the timestamp and sequence number of a measurement of a user slot."""
+        return self._timestamps[user][index], self._sequences[user][index]
+
+    def index_after(self, user: int, cursor: tuple[float, int]) -> int:
+        """Return the index of the measurement of a user slot following a cursor.
+
+        Measurements sharing the timestamp of the cursor are told apart by their
+        sequence number, so none of them is skipped.
+        """
+        timestamp, sequence = cursor
+        timestamps = self._timestamps.get(user, [])
+        start = bisect_left(timestamps, timestamp)
+        end = bisect_right(timestamps, timestamp)
+        sequences = self._sequences[user]
+        for index in range(start, end):
+            if sequences[index] == sequence:
+                return index + 1
+        return start
+
+    def index_range(
+        self, user: int, start: float | None, end: float | None
+    ) -> tuple[int, int]:
+        """Return the index range of the measurements of a user slot in [start, end)."""
+        timestamps = self._timestamps.get(user, [])
+        return (
+            0 if start is None else bisect_left(timestamps, start),
+            len(timestamps) if end is None else bisect_left(timestamps, end),
+        )
+
+    def export_cursor(self, name: str) -> int | None:
+        """Return the last sequence number written to an export."""
+        return self._export_cursors.get(name)
+
+    @callback
+    def async_set_export_cursor(self, name: str, sequence: int) -> None:
+        """Record the last sequence number written to an export."""
+        self._export_cursors[name] = sequence
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @property
+    def users(self) -> list[int]:
+        """Return the user slots with history."""
+        return [user for user, measurements in self._measurements.items() if measurements]
+
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[list[EtekcityBPMeasurement]], None]
+    ) -> Callable[[], None]:
+        """Listen for new measurements, return a callback to stop.
+
+        The listener is called once per added batch with its time-ordered new
+        measurements.
+        """
+        self._listeners.append(listener)
+
+        @callback
+        def _async_remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return _async_remove_listener
+
+    @callback
+    def async_add(self, measurement: EtekcityBPMeasurement) -> bool:
+        """Add a measurement, return False if it is already known."""
+        if not self._insert(measurement):
+            return False
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return True
+
+    @callback
+    def async_add_many(self, measurements: Iterable[EtekcityBPMeasurement]) -> int:
+        """Add a batch of measurements, return the number of new ones.
+
+        The new measurements of a user slot are merged into the history in one
+        pass, instead of being inserted one by one.
+        """
+        new: dict[int, list[EtekcityBPMeasurement]] = {}
+        added: list[EtekcityBPMeasurement] = []
+        for measurement in sorted(measurements, key=lambda item: item.timestamp):
+            accepted = new.setdefault(measurement.user, [])
+            if self._is_duplicate(measurement) or any(
+                _same_reading(known, measurement)
+                for known in _recent(accepted, measurement.timestamp - DUPLICATE_WINDOW)
+            ):
+                continue
+            accepted.append(measurement)
+            added.append(measurement)
+
+        for user, accepted in new.items():
+            if not accepted:
+                continue
+            first_sequence = self.last_sequence + 1
+            self.last_sequence += len(accepted)
+            entries = list(
+                heapq.merge(
+                    zip(self._measurements.get(user, []), self._sequences.get(user, [])),
+                    zip(accepted, range(first_sequence, self.last_sequence + 1)),
+                    key=lambda entry: entry[0].timestamp,
+                )
+            )
+            self._measurements[user] = [measurement for measurement, _ in entries]
+            self._timestamps[user] = [measurement.timestamp for measurement, _ in entries]
+            self._sequences[user] = [sequence for _, sequence in entries]
+
+        if added:
+            for listener in self._listeners:
+                listener(added)
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return len(added)
+
+    def _is_duplicate(self, measurement: EtekcityBPMeasurement) -> bool:
+        """Return if a measurement is already in the history."""
+        timestamps = self._timestamps.get(measurement.user, [])
+        start = bisect_left(timestamps, measurement.timestamp - DUPLICATE_WINDOW)
+        end = bisect_right(timestamps, measurement.timestamp + DUPLICATE_WINDOW)
+        return any(
+            _same_reading(known, measurement)
+            for known in self._measurements.get(measurement.user, [])[start:end]
+        )
+
+    def _insert(self, measurement: EtekcityBPMeasurement) -> bool:
+        """Insert a measurement in time order unless it is a duplicate."""
+        if self._is_duplicate(measurement):
+            return False
+        measurements = self._measurements.setdefault(measurement.user, [])
+        timestamps = self._timestamps.setdefault(measurement.user, [])
+        sequences = self._sequences.setdefault(measurement.user, [])
+        key = measurement.timestamp
+        position = bisect_right(timestamps, key)
+        measurements.insert(position, measurement)
+        timestamps.insert(position, key)
+        self.last_sequence += 1
+        sequences.insert(position, self.last_sequence)
+        for listener in self._listeners:
+            listener([measurement])
+        return True
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {
+            "measurements": [
+                {**measurement.as_dict(), "sequence": sequence}
+                for user, measurements in self._measurements.items()
+                for measurement, sequence in zip(measurements, self._sequences[user])
+            ],
+            "last_sequence": self.last_sequence,
+            "export_cursors": self._export_cursors,
+        }
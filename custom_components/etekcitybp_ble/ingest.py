@@ -0,0 +1,109 @@
+"""Offline ingestion of captured EtekcityBP notification logs.
+
+Debug logs of the coordinator contain lines such as::
+
+    2025-03-01 07:45:12.345 DEBUG (MainThread) [custom_components.etekcitybp_ble.coordinator] Notification - Handle: 13, Data: a5220213...
+
+The log is streamed through a chain of generators, so memory use does not
+depend on the size of the log, and the frames are run through the same
+decoder the live device uses.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+import gzip
+import logging
+import re
+
+from homeassistant.util import dt as dt_util
+
+from .device import EtekcityBPDevice, EtekcityBPMeasurement
+
+_LOGGER = logging.getLogger(__name__)
+
+NOTIFICATION_MARKER = "Notification - Handle: "
+DATA_MARKER = ", Data: "
+CONNECTING_MARKER = "Connecting to device "
+TIMESTAMP_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?) ")
+BATCH_SIZE = 4096
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Yield the lines of a plain or gzip compressed log file."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as log:
+        yield from log
+
+
+def select_notifications(
+    lines: Iterable[str], address: str | None = None
+) -> Iterator[tuple[float, str]]:
+    """Yield the timestamp and hex data of the notification lines of a device."""
+    time_zone = dt_util.get_default_time_zone()
+    current_address: str | None = None
+    for line in lines:
+        if NOTIFICATION_MARKER not in line:
+            if CONNECTING_MARKER in line:
+                current_address = line.rpartition(CONNECTING_MARKER)[2].strip().upper()
+            continue
+        if (
+            address is not None
+            and current_address is not None
+            and current_address != address.upper()
+        ):
+            continue
+        if (match := TIMESTAMP_PATTERN.match(line)) is None:
+            continue
+        timestamp = datetime.fromisoformat(match[1]).replace(tzinfo=time_zone)
+        yield timestamp.timestamp(), line.rpartition(DATA_MARKER)[2].strip()
+
+
+def decode_frames(
+    notifications: Iterable[tuple[float, str]],
+) -> Iterator[tuple[float, bytes]]:
+    """Yield the notification frames as bytes."""
+    for timestamp, data in notifications:
+        try:
+            yield timestamp, bytes.fromhex(data)
+        except ValueError:
+            _LOGGER.debug(f"Skipping malformed frame: {data}")
+
+
+def _batches[_T](items: Iterable[_T]) -> Iterator[list[_T]]:
+    """Yield the items in lists of BATCH_SIZE."""
+    batch: list[_T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def reconstruct_measurements(
+    frames: Iterable[tuple[float, bytes]],
+) -> Iterator[EtekcityBPMeasurement]:
+    """Yield the measurements committed by the device decoder."""
+    device = EtekcityBPDevice()
+    committed: list[EtekcityBPMeasurement] = []
+    device.register_measurement_callback(committed.append)
+    for timestamp, data in frames:
+        device.process_frame(data, timestamp)
+        if committed:
+            yield from committed
+            committed.clear()
+
+
+def ingest_log(
+    path: str, address: str | None = None
+) -> Iterator[list[EtekcityBPMeasurement]]:
+    """Yield the measurements reconstructed from a log file in batches.
+
+    Only one batch is held at a time, the caller applies each batch before
+    the next one is read.
+    """
+    notifications = select_notifications(read_lines(path), address)
+    yield from _batches(reconstruct_measurements(decode_frames(notifications)))
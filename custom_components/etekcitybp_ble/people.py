@@ -0,0 +1,198 @@
+"""Per person measurement timelines across EtekcityBP devices."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable
+from dataclasses import dataclass
+import heapq
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .device import EtekcityBPMeasurement
+from .history import EtekcityBPHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PEOPLE: HassKey[EtekcityBPPeople] = HassKey(DOMAIN)
+
+
+@dataclass(slots=True)
+class EtekcityBPPersonReading:
+    """A measurement of a person and the monitor it was taken on."""
+
+    measurement: EtekcityBPMeasurement
+    address: str
+
+
+@dataclass(slots=True)
+class EtekcityBPRollingMeans:
+    """Mean values of the readings of a person over a period."""
+
+    count: int
+    systolic: float
+    diastolic: float
+    pulse: float
+
+
+class EtekcityBPPersonTimeline:
+    """Time-ordered readings of a person from every mapped monitor user slot."""
+
+    def __init__(self, person: str) -> None:
+        """Initialize the timeline."""
+        self.person = person
+        self.sources: set[tuple[str, int]] = set()
+        self._readings: list[EtekcityBPPersonReading] = []
+        # Time index, the timestamps of _readings in the same order
+        self._timestamps: list[float] = []
+
+    def add_source(
+        self, address: str, user: int, measurements: list[EtekcityBPMeasurement]
+    ) -> None:
+        """Merge the time-ordered measurements of a monitor user slot."""
+        self.sources.add((address, user))
+        self.add(measurements, address)
+
+    def remove_source(self, address: str, user: int) -> None:
+        """Drop the measurements of a monitor user slot."""
+        self.sources.discard((address, user))
+        self._readings = [
+            reading
+            for reading in self._readings
+            if (reading.address, reading.measurement.user) != (address, user)
+        ]
+        self._timestamps = [reading.measurement.timestamp for reading in self._readings]
+
+    def add(self, measurements: list[EtekcityBPMeasurement], address: str) -> None:
+        """Merge time-ordered measurements of a monitor in one pass."""
+        self._readings = list(
+            heapq.merge(
+                self._readings,
+                (EtekcityBPPersonReading(measurement, address) for measurement in measurements),
+                key=lambda reading: reading.measurement.timestamp,
+            )
+        )
+        self._timestamps = [reading.measurement.timestamp for reading in self._readings]
+
+    @property
+    def latest(self) -> EtekcityBPPersonReading | None:
+        """Return the latest reading."""
+        return self._readings[-1] if self._readings else None
+
+    def rolling_means(self, start: float) -> EtekcityBPRollingMeans | None:
+        """Return the means of the readings taken since start."""
+        readings = self._readings[bisect_left(self._timestamps, start) :]
+        if not readings:
+            return None
+        count = len(readings)
+        return EtekcityBPRollingMeans(
+            count,
+            sum(reading.measurement.systolic for reading in readings) / count,
+            sum(reading.measurement.diastolic for reading in readings) / count,
+            sum(reading.measurement.pulse for reading in readings) / count,
+        )
+
+
+class EtekcityBPPeople:
+    """Timelines of the people mapped to monitor user slots."""
+
+    def __init__(self) -> None:
+        """Initialize the people."""
+        self.timelines: dict[str, EtekcityBPPersonTimeline] = {}
+        self._persons: dict[tuple[str, int], str] = {}
+        # Config entries that can provide the entities of a person, by entry id
+        # with the callback adding them. The first one provides them.
+        self._providers: dict[str, dict[str, Callable[[], None]]] = {}
+        self._listeners: dict[str, list[Callable[[], None]]] = {}
+
+    @callback
+    def async_add_source(
+        self, person: str, address: str, user: int, history: EtekcityBPHistory
+    ) -> Callable[[], None]:
+        """Map a monitor user slot to a person, return a callback to unmap it."""
+        timeline = self.timelines.get(person)
+        if timeline is None:
+            timeline = self.timelines[person] = EtekcityBPPersonTimeline(person)
+        timeline.add_source(address, user, history.measurements(user))
+        self._persons[(address, user)] = person
+        self._async_notify(person)
+
+        @callback
+        def _async_add_measurements(measurements: list[EtekcityBPMeasurement]) -> None:
+            if new := [measurement for measurement in measurements if measurement.user == user]:
+                timeline.add(new, address)
+                self._async_notify(person)
+
+        remove_listener = history.async_add_listener(_async_add_measurements)
+
+        @callback
+        def _async_remove_source() -> None:
+            remove_listener()
+            self._persons.pop((address, user), None)
+            timeline.remove_source(address, user)
+            if not timeline.sources:
+                del self.timelines[person]
+            self._async_notify(person)
+
+        return _async_remove_source
+
+    @callback
+    def async_add_provider(
+        self, person: str, entry_id: str, add_entities: Callable[[], None]
+    ) -> None:
+        """Offer a config entry to provide the entities of a person.
+
+        The first entry offered adds them, the next one takes over when it is
+        released.
+        """
+        providers = self._providers.setdefault(person, {})
+        if entry_id in providers:
+            # The person is mapped to both user slots of the monitor
+            return
+        providers[entry_id] = add_entities
+        if len(providers) == 1:
+            add_entities()
+
+    @callback
+    def async_release(self, entry_id: str) -> None:
+        """Withdraw a config entry from providing the entities of people."""
+        for person, providers in list(self._providers.items()):
+            if entry_id not in providers:
+                continue
+            provided = next(iter(providers)) == entry_id
+            del providers[entry_id]
+            if not providers:
+                del self._providers[person]
+            elif provided:
+                _LOGGER.debug(f"Moving the entities of {person} to another monitor")
+                next(iter(providers.values()))()
+
+    @callback
+    def async_add_listener(
+        self, person: str, listener: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Listen for changes of the timeline of a person, return a callback to stop."""
+        self._listeners.setdefault(person, []).append(listener)
+
+        @callback
+        def _async_remove_listener() -> None:
+            self._listeners[person].remove(listener)
+
+        return _async_remove_listener
+
+    @callback
+    def _async_notify(self, person: str) -> None:
+        """Call the listeners of a person."""
+        for listener in self._listeners.get(person, []):
+            listener()
+
+
+@callback
+def async_get_people(hass: HomeAssistant) -> EtekcityBPPeople:
+    """Return the people timelines."""
+    if (people := hass.data.get(DATA_PEOPLE)) is None:
+        people = hass.data[DATA_PEOPLE] = EtekcityBPPeople()
+    return people
@@ -0,0 +1,128 @@
+"""Measurement schedule predictor for EtekcityBP devices."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+import logging
+from statistics import median
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .device import EtekcityBPMeasurement
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+BIN_MINUTES = 30
+BINS = 24 * 60 // BIN_MINUTES
+# Older measurements fade out so a changed routine is picked up within weeks
+DECAY = 0.98
+MIN_MEASUREMENTS = 5
+# Share of the measurements a bin and its neighbours need to be a window
+WINDOW_SHARE = 0.1
+LATENCY_SAMPLES = 50
+
+
+class EtekcityBPSchedulePredictor:
+    """Time of day histogram of the measurements of a device."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the predictor."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.schedule.{entry_id}"
+        )
+        self._histogram: list[float] = [0.0] * BINS
+        self._measurements = 0
+        # Measurements taken once trained, the hit rate is counted over them
+        self._scored = 0
+        self._hits = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    async def async_load(self) -> None:
+        """Load the predictor from storage."""
+        if not (data := await self._store.async_load()):
+            return
+        self._histogram = data["histogram"]
+        self._measurements = data["measurements"]
+        self._hits = data["hits"]
+        self._scored = data.get(
+            "scored", max(self._measurements - MIN_MEASUREMENTS, 0)
+        )
+        self._latencies.extend(data.get("latencies", []))
+
+    async def async_save(self) -> None:
+        """Write the predictor to storage now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the stored predictor."""
+        await self._store.async_remove()
+
+    @property
+    def trained(self) -> bool:
+        """Return if enough measurements were seen to predict."""
+        return self._measurements >= MIN_MEASUREMENTS
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the share of measurements taken in a predicted window."""
+        if not self._scored:
+            return None
+        return self._hits / self._scored
+
+    @property
+    def median_latency(self) -> float | None:
+        """Return the median seconds from wake-up to the first notification."""
+        if not self._latencies:
+            return None
+        return median(self._latencies)
+
+    def in_window(self, now: datetime) -> bool:
+        """Return if now falls in a predicted measurement window."""
+        if not self.trained:
+            return False
+        now = dt_util.as_local(now)
+        current = (now.hour * 60 + now.minute) // BIN_MINUTES
+        total = sum(self._histogram)
+        weight = sum(
+            self._histogram[(current + offset) % BINS] for offset in (-1, 0, 1)
+        )
+        return bool(total) and weight / total >= WINDOW_SHARE
+
+    @callback
+    def async_record(self, measurement: EtekcityBPMeasurement) -> None:
+        """Add a committed measurement to the histogram."""
+        measured_at = dt_util.as_local(dt_util.utc_from_timestamp(measurement.timestamp))
+        if self.trained:
+            self._scored += 1
+            if self.in_window(measured_at):
+                self._hits += 1
+        self._measurements += 1
+        self._histogram = [weight * DECAY for weight in self._histogram]
+        self._histogram[(measured_at.hour * 60 + measured_at.minute) // BIN_MINUTES] += 1
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_record_latency(self, seconds: float) -> None:
+        """Record the time from wake-up to the first notification."""
+        _LOGGER.debug(f"Wake to first notification: {seconds:.1f} s")
+        self._latencies.append(seconds)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {
+            "histogram": self._histogram,
+            "measurements": self._measurements,
+            "scored": self._scored,
+            "hits": self._hits,
+            "latencies": list(self._latencies),
+        }
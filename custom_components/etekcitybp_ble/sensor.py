@@ -5,6 +5,7 @@ from __future__ import annotations
 from homeassistant.components.sensor import (
     RestoreSensor,
     SensorDeviceClass,
+    SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
@@ -12,25 +13,38 @@ from homeassistant.components.sensor import (
 from homeassistant.components.bluetooth import async_last_service_info
 from homeassistant.const import (
         EntityCategory,
+        PERCENTAGE,
         SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
         UnitOfPressure,
+        UnitOfTime,
 )
 from homeassistant.const import (
     STATE_UNAVAILABLE, 
     STATE_UNKNOWN
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    BP_CATEGORIES,
     BPM,
+    CONF_PERSONS,
+    DOMAIN,
+    MANUFACTURER,
+    READING_QUALITIES,
     HW_VERSION_KEY,
     SW_VERSION_KEY,
 )
 from .coordinator import EtekcityConfigEntry, EtekcityBPCoordinator
 from .entity import EtekcityBPEntity
+from .people import EtekcityBPPeople, async_get_people
 
+from datetime import datetime, timedelta
+from functools import partial
 import logging
 
 IGNORED_STATES = {STATE_UNAVAILABLE, STATE_UNKNOWN}
@@ -141,12 +155,108 @@ SENSOR_TYPES: dict[str, SensorEntityDescription] = {
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision = 0,
     ),
+    "bp_category0": SensorEntityDescription(
+        key="bp_category0",
+        name ="Blood Pressure Category User 1",
+        translation_key="bp_category",
+        device_class=SensorDeviceClass.ENUM,
+        options=BP_CATEGORIES,
+        icon="mdi:clipboard-pulse-outline",
+    ),
+    "pulse_pressure0": SensorEntityDescription(
+        key="pulse_pressure0",
+        name ="Pulse Pressure User 1",
+        device_class=SensorDeviceClass.PRESSURE,
+        native_unit_of_measurement=UnitOfPressure.MMHG,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "mean_arterial_pressure0": SensorEntityDescription(
+        key="mean_arterial_pressure0",
+        name ="Mean Arterial Pressure User 1",
+        device_class=SensorDeviceClass.PRESSURE,
+        native_unit_of_measurement=UnitOfPressure.MMHG,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "reading_quality0": SensorEntityDescription(
+        key="reading_quality0",
+        name ="Reading Quality User 1",
+        translation_key="reading_quality",
+        device_class=SensorDeviceClass.ENUM,
+        options=READING_QUALITIES,
+        icon="mdi:check-decagram-outline",
+    ),
+    "bp_category1": SensorEntityDescription(
+        key="bp_category1",
+        name ="Blood Pressure Category User 2",
+        translation_key="bp_category",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.ENUM,
+        options=BP_CATEGORIES,
+        icon="mdi:clipboard-pulse-outline",
+    ),
+    "pulse_pressure1": SensorEntityDescription(
+        key="pulse_pressure1",
+        name ="Pulse Pressure User 2",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.PRESSURE,
+        native_unit_of_measurement=UnitOfPressure.MMHG,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "mean_arterial_pressure1": SensorEntityDescription(
+        key="mean_arterial_pressure1",
+        name ="Mean Arterial Pressure User 2",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.PRESSURE,
+        native_unit_of_measurement=UnitOfPressure.MMHG,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "reading_quality1": SensorEntityDescription(
+        key="reading_quality1",
+        name ="Reading Quality User 2",
+        translation_key="reading_quality",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.ENUM,
+        options=READING_QUALITIES,
+        icon="mdi:check-decagram-outline",
+    ),
     "display_units": SensorEntityDescription(
         key="display_units",
         name ="Display Units",
         entity_registry_enabled_default=False,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
+    "schedule_hit_rate": SensorEntityDescription(
+        key="schedule_hit_rate",
+        name ="Schedule Hit Rate",
+        icon="mdi:calendar-clock",
+        entity_registry_enabled_default=False,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "wake_latency": SensorEntityDescription(
+        key="wake_latency",
+        name ="Wake To Notification Latency",
+        device_class=SensorDeviceClass.DURATION,
+        entity_registry_enabled_default=False,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 1,
+    ),
+    "rejected_frames": SensorEntityDescription(
+        key="rejected_frames",
+        name ="Rejected Frames",
+        icon="mdi:filter-remove-outline",
+        entity_registry_enabled_default=False,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
     "error_code": SensorEntityDescription(
         key="error_code",
         name ="Error Code",
@@ -155,6 +265,75 @@ SENSOR_TYPES: dict[str, SensorEntityDescription] = {
     ),  
 }
 
+SCHEDULE_SENSORS = {"schedule_hit_rate", "wake_latency"}
+
+REJECTED_FRAMES_SENSOR = "rejected_frames"
+
+ROLLING_WINDOW = timedelta(days=7)
+ROLLING_UPDATE_INTERVAL = timedelta(minutes=15)
+
+PERSON_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
+    "systolic": SensorEntityDescription(
+        key="systolic",
+        name ="Systolic Pressure",
+        device_class=SensorDeviceClass.PRESSURE,
+        native_unit_of_measurement=UnitOfPressure.MMHG,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "diastolic": SensorEntityDescription(
+        key="diastolic",
+        name ="Diastolic Pressure",
+        device_class=SensorDeviceClass.PRESSURE,
+        native_unit_of_measurement=UnitOfPressure.MMHG,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "pulse": SensorEntityDescription(
+        key="pulse",
+        name ="Pulse",
+        icon="mdi:heart-pulse",
+        native_unit_of_measurement=BPM,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "last_measured": SensorEntityDescription(
+        key="last_measured",
+        name ="Last Measured",
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+    "systolic_7d": SensorEntityDescription(
+        key="systolic_7d",
+        name ="Systolic Pressure 7 Day Mean",
+        device_class=SensorDeviceClass.PRESSURE,
+        native_unit_of_measurement=UnitOfPressure.MMHG,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "diastolic_7d": SensorEntityDescription(
+        key="diastolic_7d",
+        name ="Diastolic Pressure 7 Day Mean",
+        device_class=SensorDeviceClass.PRESSURE,
+        native_unit_of_measurement=UnitOfPressure.MMHG,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "pulse_7d": SensorEntityDescription(
+        key="pulse_7d",
+        name ="Pulse 7 Day Mean",
+        icon="mdi:heart-pulse",
+        native_unit_of_measurement=BPM,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision = 0,
+    ),
+    "readings_7d": SensorEntityDescription(
+        key="readings_7d",
+        name ="Readings 7 Days",
+        icon="mdi:counter",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -167,11 +346,43 @@ async def async_setup_entry(
     entities = [
         EtekcityBPSensor(coordinator, sensor)
         for sensor in SENSOR_TYPES
-        if sensor != "rssi" 
+        if sensor not in SCHEDULE_SENSORS
+        and sensor not in (REJECTED_FRAMES_SENSOR, "rssi")
     ]
     entities.append(EtekcityBPRSSISensor(coordinator, "rssi"))
+    entities.extend(
+        EtekcityBPScheduleSensor(coordinator, sensor) for sensor in SCHEDULE_SENSORS
+    )
+    entities.append(EtekcityBPRejectedFramesSensor(coordinator, REJECTED_FRAMES_SENSOR))
+
     async_add_entities(entities)
 
+    people = async_get_people(hass)
+    for conf_person in CONF_PERSONS:
+        if person := entry.options.get(conf_person):
+            # A person mapped on several monitors gets its entities from one entry
+            people.async_add_provider(
+                person,
+                entry.entry_id,
+                partial(_async_add_person_entities, hass, people, person, async_add_entities),
+            )
+
+
+@callback
+def _async_add_person_entities(
+    hass: HomeAssistant,
+    people: EtekcityBPPeople,
+    person: str,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Add the sensor entities of a person."""
+    state = hass.states.get(person)
+    person_name = state.name if state else person.split(".", 1)[1].replace("_", " ").title()
+    async_add_entities(
+        EtekcityBPPersonSensor(people, person, person_name, sensor)
+        for sensor in PERSON_SENSOR_TYPES
+    )
+
    
 class EtekcityBPSensor(EtekcityBPEntity, RestoreSensor):
     """Representation of a EtekcityBP sensor."""
@@ -239,4 +450,109 @@ class EtekcityBPRSSISensor(EtekcityBPSensor):
                 )
                 self._attr_device_info.update(
                     {HW_VERSION_KEY: self._hw_version, SW_VERSION_KEY: self._sw_version}
-                )
\ No newline at end of file
+                )
+
+
+class EtekcityBPScheduleSensor(EtekcityBPSensor):
+    """Representation of a EtekcityBP measurement schedule predictor sensor."""
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        predictor = self.coordinator.predictor
+        if self._sensor == "wake_latency":
+            return predictor.median_latency
+        if (hit_rate := predictor.hit_rate) is None:
+            return None
+        return hit_rate * 100
+
+
+class EtekcityBPRejectedFramesSensor(EtekcityBPSensor):
+    """Representation of the frames a EtekcityBP device rejected."""
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return sum(self._device.rejected_frames.values())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the rejected frames per reason."""
+        return dict(self._device.rejected_frames)
+
+
+class EtekcityBPPersonSensor(SensorEntity):
+    """Representation of a sensor of the merged readings of a person."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        people: EtekcityBPPeople,
+        person: str,
+        person_name: str,
+        sensor: str,
+    ) -> None:
+        """Initialize the person sensor."""
+        self._people = people
+        self._person = person
+        self._sensor = sensor
+        self._attr_unique_id = f"{person}-{sensor}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, person)},
+            entry_type=DeviceEntryType.SERVICE,
+            manufacturer=MANUFACTURER,
+            name=f"{person_name} Blood Pressure",
+        )
+        self.entity_description = PERSON_SENSOR_TYPES[sensor]
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state when the timeline of the person changes."""
+        self.async_on_remove(
+            self._people.async_add_listener(self._person, self.async_write_ha_state)
+        )
+        if self._sensor.endswith("_7d"):
+            # Readings also leave the rolling window as time passes
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass, self._async_update_rolling, ROLLING_UPDATE_INTERVAL
+                )
+            )
+
+    @callback
+    def _async_update_rolling(self, _now: datetime) -> None:
+        """Update the rolling window state."""
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float | datetime | None:
+        """Return the state of the sensor."""
+        if (timeline := self._people.timelines.get(self._person)) is None:
+            return None
+
+        if self._sensor.endswith("_7d"):
+            means = timeline.rolling_means(
+                dt_util.utcnow().timestamp() - ROLLING_WINDOW.total_seconds()
+            )
+            if self._sensor == "readings_7d":
+                return means.count if means else 0
+            if means is None:
+                return None
+            return getattr(means, self._sensor.removesuffix("_7d"))
+
+        if (latest := timeline.latest) is None:
+            return None
+        if self._sensor == "last_measured":
+            return dt_util.utc_from_timestamp(latest.measurement.timestamp)
+        return getattr(latest.measurement, self._sensor)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str] | None:
+        """Return the monitor of the latest reading."""
+        if self._sensor != "last_measured":
+            return None
+        timeline = self._people.timelines.get(self._person)
+        if timeline is None or timeline.latest is None:
+            return None
+        return {"monitor": timeline.latest.address}
@@ -0,0 +1,242 @@
+"""Services for the EtekcityBP integration."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path, PurePath
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util.async_ import run_callback_threadsafe
+
+from .const import (
+    COMMAND_REQUEST_HISTORY,
+    COMMAND_SET_DISPLAY_UNITS,
+    COMMAND_SYNC_TIME,
+    DISPLAY_UNITS_KPA,
+    DISPLAY_UNITS_MMHG,
+    DOMAIN,
+    EXPORT_DIRECTORY,
+    USERS,
+)
+from .coordinator import EtekcityBPCoordinator
+from .export import EXPORT_FORMATS, FORMAT_CSV, write_export
+from .ingest import ingest_log
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_FORMAT = "format"
+ATTR_PATH = "path"
+ATTR_SINCE_LAST_EXPORT = "since_last_export"
+ATTR_UNITS = "units"
+ATTR_USER = "user"
+
+SERVICE_SET_DISPLAY_UNITS = "set_display_units"
+SERVICE_SYNC_TIME = "sync_time"
+SERVICE_REQUEST_HISTORY = "request_history"
+SERVICE_IMPORT_LOG = "import_log"
+SERVICE_EXPORT_HISTORY = "export_history"
+
+# Served without authentication at /local/, never read or written by the services
+WWW_DIRECTORY = "www"
+
+DEVICE_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+
+SET_DISPLAY_UNITS_SCHEMA = DEVICE_SCHEMA.extend(
+    {vol.Required(ATTR_UNITS): vol.In([DISPLAY_UNITS_MMHG, DISPLAY_UNITS_KPA])}
+)
+
+REQUEST_HISTORY_SCHEMA = DEVICE_SCHEMA.extend(
+    {vol.Required(ATTR_USER): vol.All(vol.Coerce(int), vol.Range(min=1, max=USERS))}
+)
+
+IMPORT_LOG_SCHEMA = DEVICE_SCHEMA.extend({vol.Required(ATTR_PATH): cv.string})
+
+EXPORT_HISTORY_SCHEMA = REQUEST_HISTORY_SCHEMA.extend(
+    {
+        vol.Required(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_FORMAT, default=FORMAT_CSV): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_SINCE_LAST_EXPORT, default=False): cv.boolean,
+    }
+)
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant, device_id: str) -> EtekcityBPCoordinator:
+    """Return the coordinator of a loaded config entry for a device."""
+    device_entry = dr.async_get(hass).async_get(device_id)
+    if device_entry is None:
+        raise ServiceValidationError(f"Unknown device: {device_id}")
+
+    for entry_id in device_entry.config_entries:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if (
+            entry is not None
+            and entry.domain == DOMAIN
+            and entry.state is ConfigEntryState.LOADED
+        ):
+            return entry.runtime_data
+
+    raise ServiceValidationError(
+        f"Device {device_id} is not a loaded Etekcity blood pressure monitor"
+    )
+
+
+def _resolve_path(config_dir: str, path: str, directory: str = "") -> str:
+    """Return a relative path resolved below a directory of the configuration directory.
+
+    Resolving follows symbolic links, so this does blocking I/O.
+    """
+    location = directory or "the configuration directory"
+    if PurePath(path).is_absolute() or ".." in PurePath(path).parts:
+        raise ServiceValidationError(f"{path} must be a relative path below {location}")
+    base = Path(config_dir, directory).resolve()
+    resolved = (base / path).resolve()
+    if (
+        resolved == base
+        or not resolved.is_relative_to(base)
+        or resolved.is_relative_to(Path(config_dir, WWW_DIRECTORY).resolve())
+    ):
+        raise ServiceValidationError(f"{path} is not a file below {location}")
+    return str(resolved)
+
+
+@callback
+def _async_get_command_coordinator(
+    hass: HomeAssistant, device_id: str
+) -> EtekcityBPCoordinator:
+    """Return the coordinator of a device that device commands are enabled for."""
+    coordinator = async_get_coordinator(hass, device_id)
+    if not coordinator.commands_enabled:
+        raise ServiceValidationError(
+            f"Device commands are not enabled for {coordinator.device_name}. The command "
+            "protocol is not confirmed, enable them in the integration options to use it"
+        )
+    return coordinator
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up the services for the EtekcityBP integration."""
+
+    @callback
+    def async_set_display_units(call: ServiceCall) -> None:
+        """Queue a display units command."""
+        coordinator = _async_get_command_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        coordinator.async_queue_command(
+            COMMAND_SET_DISPLAY_UNITS, argument=call.data[ATTR_UNITS]
+        )
+
+    @callback
+    def async_sync_time(call: ServiceCall) -> None:
+        """Queue a clock synchronisation command."""
+        coordinator = _async_get_command_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        coordinator.async_queue_command(COMMAND_SYNC_TIME)
+
+    @callback
+    def async_request_history(call: ServiceCall) -> None:
+        """Queue a stored records request."""
+        coordinator = _async_get_command_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        coordinator.async_queue_command(
+            COMMAND_REQUEST_HISTORY, user=call.data[ATTR_USER] - 1
+        )
+
+    async def async_import_log(call: ServiceCall) -> ServiceResponse:
+        """Import the measurements found in a captured notification log."""
+        coordinator = async_get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        path = await hass.async_add_executor_job(
+            _resolve_path, hass.config.config_dir, call.data[ATTR_PATH]
+        )
+
+        def import_batches() -> tuple[int, int]:
+            """Read the log, applying each batch on the event loop before the next."""
+            found = imported = 0
+            for batch in ingest_log(path, coordinator.address):
+                found += len(batch)
+                imported += run_callback_threadsafe(
+                    hass.loop, coordinator.history.async_add_many, batch
+                ).result()
+            return found, imported
+
+        try:
+            found, imported = await hass.async_add_executor_job(import_batches)
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot read log file {path}: {err}") from err
+        _LOGGER.info(f"Imported {imported} of {found} measurements from {path}")
+        return {"found": found, "imported": imported}
+
+    async def async_export_history(call: ServiceCall) -> ServiceResponse:
+        """Export the measurement history of a user to a file."""
+        coordinator = async_get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        path = await hass.async_add_executor_job(
+            _resolve_path, hass.config.config_dir, call.data[ATTR_PATH], EXPORT_DIRECTORY
+        )
+
+        user = call.data[ATTR_USER] - 1
+        export_format = call.data[ATTR_FORMAT]
+        since_last_export = call.data[ATTR_SINCE_LAST_EXPORT]
+        cursor_name = f"{export_format}:{user}:{path}"
+        cursor = (
+            coordinator.history.export_cursor(cursor_name) if since_last_export else None
+        )
+        # Measurements added while the file is written go to the next export
+        last_sequence = coordinator.history.last_sequence
+        measurements = coordinator.history.measurements_since(user, cursor)
+
+        try:
+            exported = await hass.async_add_executor_job(
+                write_export,
+                path,
+                measurements,
+                export_format,
+                coordinator.device_name,
+                since_last_export,
+            )
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot write export file {path}: {err}") from err
+
+        if measurements:
+            coordinator.history.async_set_export_cursor(cursor_name, last_sequence)
+        return {"exported": exported}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_DISPLAY_UNITS,
+        async_set_display_units,
+        schema=SET_DISPLAY_UNITS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SYNC_TIME, async_sync_time, schema=DEVICE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REQUEST_HISTORY,
+        async_request_history,
+        schema=REQUEST_HISTORY_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_LOG,
+        async_import_log,
+        schema=IMPORT_LOG_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        async_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,125 @@
+"""Connection cycle tracing for EtekcityBP devices."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+from logging.handlers import QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_BACKUP_COUNT = 3
+
+
+class EtekcityBPTraceCycle:
+    """Timeline of one connection cycle, split in consecutive phases."""
+
+    def __init__(self, cycle_id: int, address: str) -> None:
+        """Initialize the cycle."""
+        self.cycle_id = cycle_id
+        self._record: dict[str, Any] = {
+            "cycle": cycle_id,
+            "address": address,
+            "wall_time": time.time(),
+            "start": time.monotonic(),
+            "phases": [],
+            "frames": [],
+            "error": None,
+        }
+        self._phase: dict[str, Any] | None = None
+
+    def phase(self, name: str, start: float | None = None) -> None:
+        """End the current phase and start a new one."""
+        now = time.monotonic()
+        self._end_phase(now)
+        self._phase = {"name": name, "start": now if start is None else start}
+
+    def frame(self, data: bytes) -> None:
+        """Record a notification frame received in this cycle."""
+        self._record["frames"].append({"time": time.monotonic(), "data": data.hex()})
+
+    def error(self, error: Exception) -> None:
+        """Record the error that ended this cycle."""
+        self._record["error"] = repr(error)
+
+    def finish(self) -> dict[str, Any]:
+        """End the cycle and return its record."""
+        now = time.monotonic()
+        self._end_phase(now)
+        self._record["end"] = now
+        self._record["duration"] = now - self._record["start"]
+        return self._record
+
+    def _end_phase(self, now: float) -> None:
+        """End the current phase."""
+        if self._phase is None:
+            return
+        self._phase["end"] = now
+        self._phase["duration"] = now - self._phase["start"]
+        self._record["phases"].append(self._phase)
+        self._phase = None
+
+
+class _NullTraceCycle:
+    """Cycle used when tracing is disabled, every call is a no-op."""
+
+    cycle_id = None
+
+    def phase(self, name: str, start: float | None = None) -> None:
+        """Do nothing."""
+
+    def frame(self, data: bytes) -> None:
+        """Do nothing."""
+
+    def error(self, error: Exception) -> None:
+        """Do nothing."""
+
+
+NULL_TRACE_CYCLE = _NullTraceCycle()
+
+
+class EtekcityBPTracer:
+    """Write connection cycle timelines to a rotating JSONL file."""
+
+    def __init__(self, hass: HomeAssistant, address: str, path: str) -> None:
+        """Initialize the tracer."""
+        self._hass = hass
+        self._address = address
+        self._cycle_ids = itertools.count(1)
+        # delay opens the file on the first write, which runs in the executor
+        self._handler = RotatingFileHandler(
+            path,
+            maxBytes=TRACE_MAX_BYTES,
+            backupCount=TRACE_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+        # A single writer thread keeps the lines in order and owns rotation
+        self._queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+        self._listener = QueueListener(self._queue, self._handler)
+        self._listener.start()
+
+    def start_cycle(self) -> EtekcityBPTraceCycle:
+        """Start tracing a connection cycle."""
+        return EtekcityBPTraceCycle(next(self._cycle_ids), self._address)
+
+    def finish_cycle(self, cycle: EtekcityBPTraceCycle) -> None:
+        """Finish a connection cycle and write it out."""
+        line = json.dumps(cycle.finish(), separators=(",", ":"))
+        self._queue.put_nowait(logging.makeLogRecord({"msg": line}))
+
+    async def async_close(self) -> None:
+        """Write the pending lines and close the trace file."""
+        await self._hass.async_add_executor_job(self._close)
+
+    def _close(self) -> None:
+        """Stop the writer thread and close the trace file."""
+        self._listener.stop()
+        self._handler.close()
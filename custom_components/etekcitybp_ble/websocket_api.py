@@ -0,0 +1,137 @@
+"""Websocket API for the EtekcityBP integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, USERS
+from .device import EtekcityBPMeasurement
+from .services import async_get_coordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DOWNSAMPLE_NONE = "none"
+DOWNSAMPLE_DAILY = "daily"
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Set up the websocket API of the EtekcityBP integration."""
+    websocket_api.async_register_command(hass, ws_history)
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    """Return the timestamp of an optional datetime."""
+    return None if value is None else dt_util.as_timestamp(value)
+
+
+def _daily_bucket(day: str, measurements: list[EtekcityBPMeasurement]) -> dict[str, Any]:
+    """Return the min, mean and max of the measurements of a day."""
+    bucket: dict[str, Any] = {"date": day, "count": len(measurements)}
+    for field in ("systolic", "diastolic", "pulse"):
+        values = [getattr(measurement, field) for measurement in measurements]
+        bucket[field] = {
+            "min": min(values),
+            "mean": round(sum(values) / len(values), 1),
+            "max": max(values),
+        }
+    return bucket
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required("device_id"): str,
+        vol.Required("user"): vol.All(vol.Coerce(int), vol.Range(min=1, max=USERS)),
+        vol.Optional("start_time"): cv.datetime,
+        vol.Optional("end_time"): cv.datetime,
+        vol.Optional("cursor"): vol.ExactSequence(
+            [vol.Coerce(float), vol.Coerce(int)]
+        ),
+        vol.Optional("limit", default=DEFAULT_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_LIMIT)
+        ),
+        vol.Optional("downsample", default=DOWNSAMPLE_NONE): vol.In(
+            [DOWNSAMPLE_NONE, DOWNSAMPLE_DAILY]
+        ),
+    }
+)
+@callback
+def ws_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return a page of the measurement history of a user.
+
+    The cursor is the timestamp and sequence number of the last measurement of
+    the previous page, so measurements sharing a timestamp are not skipped.
+    """
+    try:
+        coordinator = async_get_coordinator(hass, msg["device_id"])
+    except ServiceValidationError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+
+    history = coordinator.history
+    user = msg["user"] - 1
+    limit = msg["limit"]
+    start, end = history.index_range(
+        user, _timestamp(msg.get("start_time")), _timestamp(msg.get("end_time"))
+    )
+    if (cursor := msg.get("cursor")) is not None:
+        start = max(start, history.index_after(user, tuple(cursor)))
+
+    measurements = history.measurements(user)
+    if msg["downsample"] == DOWNSAMPLE_NONE:
+        page_end = min(end, start + limit)
+        page = measurements[start:page_end]
+        next_cursor = history.cursor(user, page_end - 1) if page_end < end else None
+        connection.send_result(
+            msg["id"],
+            {
+                "measurements": [
+                    {**measurement.as_dict(), "user": msg["user"]} for measurement in page
+                ],
+                "next_cursor": next_cursor,
+            },
+        )
+        return
+
+    days: list[dict[str, Any]] = []
+    next_cursor = None
+    day: str | None = None
+    day_measurements: list[EtekcityBPMeasurement] = []
+    for index in range(start, end):
+        measurement = measurements[index]
+        measured_on = (
+            dt_util.as_local(dt_util.utc_from_timestamp(measurement.timestamp))
+            .date()
+            .isoformat()
+        )
+        if measured_on != day:
+            if day_measurements:
+                days.append(_daily_bucket(day, day_measurements))
+                if len(days) == limit:
+                    next_cursor = history.cursor(user, index - 1)
+                    break
+            day = measured_on
+            day_measurements = []
+        day_measurements.append(measurement)
+    else:
+        if day_measurements:
+            days.append(_daily_bucket(day, day_measurements))
+
+    connection.send_result(msg["id"], {"days": days, "next_cursor": next_cursor})
@@ -0,0 +1,114 @@
+"""Tests for the EtekcityBP integration."""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+import random
+
+LOGGER = "[custom_components.etekcitybp_ble.coordinator]"
+
+
+def measurement_frame(user: int, systolic: int, diastolic: int) -> bytes:
+    """Return a measurement notification frame."""
+    frame = bytearray(20)
+    frame[0:5] = bytes.fromhex("a522021300")
+    frame[14] = user
+    frame[15] = systolic
+    frame[17] = diastolic
+    return bytes(frame)
+
+
+def continuation_frame(pulse: int, flags: int = 0x00) -> bytes:
+    """Return the continuation frame of a measurement."""
+    return bytes([0x00, pulse, 0x00, flags, 0x00])
+
+
+def display_units_frame(kpa: bool) -> bytes:
+    """Return a display units notification frame."""
+    frame = bytearray(13)
+    frame[0:5] = bytes.fromhex("a502010700")
+    frame[10] = 0x01 if kpa else 0x00
+    return bytes(frame)
+
+
+def error_frame(code: int) -> bytes:
+    """Return an error notification frame."""
+    frame = bytearray(16)
+    frame[0:5] = bytes.fromhex("a522020a00")
+    frame[15] = code
+    return bytes(frame)
+
+
+SEED_FRAMES = [
+    measurement_frame(0, 120, 80),
+    measurement_frame(1, 145, 95),
+    continuation_frame(70),
+    continuation_frame(88, 0x01),
+    continuation_frame(64, 0x04),
+    display_units_frame(False),
+    display_units_frame(True),
+    error_frame(2),
+]
+
+
+def mutate(frame: bytes, rng: random.Random) -> bytes:
+    """Return a randomly mutated copy of a frame."""
+    data = bytearray(frame)
+    mutation = rng.randrange(6)
+    if mutation == 0 and data:
+        # Flip a bit
+        index = rng.randrange(len(data))
+        data[index] ^= 1 << rng.randrange(8)
+    elif mutation == 1 and data:
+        # Replace a byte, biased to boundary values
+        index = rng.randrange(len(data))
+        data[index] = rng.choice([0x00, 0x01, 0x02, 0x7F, 0x80, 0xFF, rng.randrange(256)])
+    elif mutation == 2:
+        # Truncate
+        del data[rng.randrange(len(data) + 1) :]
+    elif mutation == 3:
+        # Extend
+        data += bytes(rng.randrange(256) for _ in range(rng.randrange(1, 8)))
+    elif mutation == 4:
+        # Splice with another seed frame
+        other = rng.choice(SEED_FRAMES)
+        cut = rng.randrange(min(len(data), len(other)) + 1)
+        data = data[:cut] + other[cut:]
+    else:
+        # Random bytes of a random length
+        data = bytearray(rng.randrange(256) for _ in range(rng.randrange(25)))
+    return bytes(data)
+
+
+def fuzz_frames(count: int, seed: int = 0) -> list[bytes]:
+    """Return a reproducible corpus of valid and mutated frames."""
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        frame = rng.choice(SEED_FRAMES)
+        for _ in range(rng.randrange(4)):
+            frame = mutate(frame, rng)
+        frames.append(frame)
+    return frames
+
+
+def write_log(path: Path, address: str, readings: int) -> None:
+    """Write a debug log with one measurement per minute, gzip compressed for .gz."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "wt", encoding="utf-8") as log:
+        log.write(
+            f"2025-01-01 00:00:00.000 DEBUG (MainThread) {LOGGER} "
+            f"Connecting to device {address}\n"
+        )
+        for index in range(readings):
+            minute = f"{index // 60 % 24:02d}:{index % 60:02d}"
+            day = f"2025-01-{index // 1440 + 1:02d}"
+            for frame in (
+                measurement_frame(index % 2, 110 + index % 50, 70 + index % 20),
+                continuation_frame(60 + index % 40),
+            ):
+                log.write(
+                    f"{day} {minute}:00.000 DEBUG (MainThread) {LOGGER} "
+                    f"Notification - Handle: 13, Data: {frame.hex()}\n"
+                )
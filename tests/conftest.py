@@ -0,0 +1,25 @@
+"""Fixtures for the EtekcityBP integration tests."""
+
+import pytest
+
+from homeassistant.const import CONF_ADDRESS
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.etekcitybp_ble.const import DOMAIN
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable loading the integration from custom_components."""
+    yield
+
+
+@pytest.fixture
+def mock_config_entry() -> MockConfigEntry:
+    """Return a config entry of a monitor."""
+    return MockConfigEntry(
+        domain=DOMAIN, unique_id=ADDRESS, data={CONF_ADDRESS: ADDRESS}
+    )
@@ -0,0 +1,85 @@
+"""Tests for the EtekcityBP config flow."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.config_entries import SOURCE_BLUETOOTH, SOURCE_USER
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.etekcitybp_ble.const import DOMAIN, MFR_ID
+
+LOCAL_NAME = "Smart Blood Pressure Monitor"
+
+
+def _service_info(
+    address: str, rssi: int, manufacturer_data: dict[int, bytes]
+) -> BluetoothServiceInfoBleak:
+    """Return the service info of an advertisement."""
+    return BluetoothServiceInfoBleak(
+        name=LOCAL_NAME,
+        address=address,
+        rssi=rssi,
+        manufacturer_data=manufacturer_data,
+        service_data={},
+        service_uuids=[],
+        source="local",
+        device=BLEDevice(address, LOCAL_NAME, None),
+        advertisement=AdvertisementData(
+            local_name=LOCAL_NAME,
+            manufacturer_data=manufacturer_data,
+            service_data={},
+            service_uuids=[],
+            tx_power=None,
+            rssi=rssi,
+            platform_data=(),
+        ),
+        connectable=True,
+        time=time.monotonic(),
+        tx_power=None,
+    )
+
+
+MONITORS = [
+    _service_info(f"AA:BB:CC:DD:EE:0{index}", -60 - index, {MFR_ID: b"\x01"})
+    for index in range(3)
+]
+NAME_ONLY = _service_info("AA:BB:CC:DD:EE:10", -40, {})
+
+
+async def test_user_step_adds_selected_monitors(hass: HomeAssistant) -> None:
+    """Test the selected monitors are added and their discovery flows aborted."""
+    with patch(
+        "custom_components.etekcitybp_ble.config_flow.async_discovered_service_info",
+        return_value=[*MONITORS, NAME_ONLY],
+    ), patch("custom_components.etekcitybp_ble.async_setup_entry", return_value=True):
+        for service_info in MONITORS:
+            result = await hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": SOURCE_BLUETOOTH}, data=service_info
+            )
+            assert result["type"] is FlowResultType.FORM
+
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_USER}
+        )
+        assert result["type"] is FlowResultType.FORM
+        options = result["data_schema"].schema["addresses"].options
+        assert list(options) == [service_info.address for service_info in MONITORS]
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"addresses": list(options)}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert sorted(
+        entry.unique_id for entry in hass.config_entries.async_entries(DOMAIN)
+    ) == [service_info.address for service_info in MONITORS]
+    assert all(entry.source == SOURCE_USER for entry in hass.config_entries.async_entries(DOMAIN))
+    assert not hass.config_entries.flow.async_progress_by_handler(DOMAIN)
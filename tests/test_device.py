@@ -0,0 +1,156 @@
+"""Tests for the EtekcityBP notification decoder."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.etekcitybp_ble.const import (
+    DIASTOLIC_RANGE,
+    PULSE_RANGE,
+    SYSTOLIC_RANGE,
+    USERS,
+)
+from custom_components.etekcitybp_ble.device import (
+    EtekcityBPDevice,
+    EtekcityBPMeasurement,
+    bp_category,
+)
+
+from . import continuation_frame, error_frame, fuzz_frames, measurement_frame
+
+FUZZ_FRAMES = 50_000
+
+
+def _device() -> tuple[EtekcityBPDevice, list[EtekcityBPMeasurement]]:
+    device = EtekcityBPDevice()
+    committed: list[EtekcityBPMeasurement] = []
+    device.register_measurement_callback(committed.append)
+    return device, committed
+
+
+def test_measurement_is_committed() -> None:
+    """Test a measurement frame and its continuation commit a measurement."""
+    device, committed = _device()
+    device.process_frame(measurement_frame(1, 135, 85), 100.0)
+    device.process_frame(continuation_frame(72, 0x01), 101.0)
+
+    assert committed == [EtekcityBPMeasurement(100.0, 1, 135, 85, 72, False, True)]
+    assert device.sensor_data["systolic1"] == 135
+    assert device.sensor_data["pulse1"] == 72
+    assert device.sensor_data["bp_category1"] == "hypertension_stage_1"
+
+
+@pytest.mark.parametrize(
+    ("systolic", "diastolic", "category"),
+    [
+        (119, 79, "normal"),
+        (120, 79, "elevated"),
+        (129, 79, "elevated"),
+        (130, 79, "hypertension_stage_1"),
+        (119, 80, "hypertension_stage_1"),
+        (139, 89, "hypertension_stage_1"),
+        (140, 70, "hypertension_stage_2"),
+        (125, 90, "hypertension_stage_2"),
+        (180, 120, "hypertension_stage_2"),
+        (181, 100, "hypertensive_crisis"),
+        (170, 121, "hypertensive_crisis"),
+    ],
+)
+def test_bp_category(systolic: int, diastolic: int, category: str) -> None:
+    """Test the AHA category thresholds."""
+    assert bp_category(systolic, diastolic) == category
+
+
+def test_derived_values() -> None:
+    """Test the pulse pressure and mean arterial pressure of a measurement."""
+    device, _ = _device()
+    device.process_frame(measurement_frame(0, 120, 80), 100.0)
+    device.process_frame(continuation_frame(70), 101.0)
+
+    assert device.sensor_data["pulse_pressure0"] == 40
+    assert device.sensor_data["mean_arterial_pressure0"] == 93.3
+    assert device.sensor_data["reading_quality0"] == "good"
+
+
+@pytest.mark.parametrize(
+    ("flags", "motion_indicator", "irregular_heartbeat", "quality"),
+    [
+        (0x00, False, False, "good"),
+        (0x01, True, False, "motion"),
+        (0x04, False, True, "irregular_heartbeat"),
+        (0x05, True, True, "motion_irregular_heartbeat"),
+    ],
+)
+def test_reading_quality(
+    flags: int, motion_indicator: bool, irregular_heartbeat: bool, quality: str
+) -> None:
+    """Test the motion and irregular heartbeat bits are decoded independently."""
+    device, committed = _device()
+    device.process_frame(measurement_frame(0, 120, 80), 100.0)
+    device.process_frame(continuation_frame(70, flags), 101.0)
+
+    assert committed[0].motion_indicator is motion_indicator
+    assert committed[0].irregular_heartbeat is irregular_heartbeat
+    assert device.sensor_data["reading_quality0"] == quality
+
+
+def test_rejected_frames_drop_pending_measurement() -> None:
+    """Test a continuation after rejected frames does not complete an older reading."""
+    device, committed = _device()
+    device.process_frame(measurement_frame(0, 120, 80), 100.0)
+    device.process_frame(continuation_frame(5), 101.0)
+    device.process_frame(measurement_frame(0, 10, 5), 102.0)
+    device.process_frame(continuation_frame(99), 103.0)
+
+    assert committed == []
+    assert device.rejected_frames == {
+        "pulse_out_of_range": 1,
+        "systolic_out_of_range": 1,
+        "continuation_without_measurement": 1,
+    }
+
+
+def test_continuation_needs_measurement() -> None:
+    """Test a continuation frame is rejected unless a measurement is pending."""
+    device, committed = _device()
+    device.process_frame(measurement_frame(0, 120, 80), 100.0)
+    device.process_frame(continuation_frame(70), 101.0)
+    device.process_frame(continuation_frame(90), 102.0)
+    device.process_frame(measurement_frame(0, 125, 82), 103.0)
+    device.process_frame(error_frame(2), 104.0)
+    device.process_frame(continuation_frame(75), 105.0)
+
+    assert [measurement.pulse for measurement in committed] == [70]
+    assert device.rejected_frames == {"continuation_without_measurement": 2}
+    assert device.sensor_data["error_code"] == "E03"
+
+
+def test_unknown_frames_keep_pending_measurement() -> None:
+    """Test frames of unknown types are counted apart and do not drop a reading."""
+    device, committed = _device()
+    device.process_frame(measurement_frame(0, 120, 80), 100.0)
+    device.process_frame(bytes.fromhex("a502030100015b"), 100.5)
+    device.process_frame(continuation_frame(70), 101.0)
+
+    assert [measurement.pulse for measurement in committed] == [70]
+    assert device.rejected_frames == {}
+    assert device.unknown_frames == 1
+    assert device.last_unknown_frames[0].data == "a502030100015b"
+
+
+def test_fuzz_corpus() -> None:
+    """Test mutated frames never raise and only touch the user slot keys."""
+    device, committed = _device()
+    keys = set(device.sensor_data)
+
+    for timestamp, frame in enumerate(fuzz_frames(FUZZ_FRAMES)):
+        device.process_frame(frame, float(timestamp))
+
+    assert set(device.sensor_data) == keys
+    assert device.rejected_frames.total() > 0
+    assert committed
+    for measurement in committed:
+        assert measurement.user in range(USERS)
+        assert measurement.systolic in SYSTOLIC_RANGE
+        assert measurement.diastolic in DIASTOLIC_RANGE
+        assert measurement.pulse in PULSE_RANGE
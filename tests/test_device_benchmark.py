@@ -0,0 +1,28 @@
+"""Decode throughput benchmark of the EtekcityBP notification decoder."""
+
+from __future__ import annotations
+
+import time
+
+from custom_components.etekcitybp_ble.device import EtekcityBPDevice
+
+from . import fuzz_frames
+
+BENCHMARK_FRAMES = 200_000
+# Several hundred thousand frames per second are decoded on a desktop CPU, the budget
+# leaves room for slow CI runners and single board computers.
+MIN_FRAMES_PER_SECOND = 20_000
+
+
+def test_decode_throughput() -> None:
+    """Test validating and decoding frames stays above the throughput budget."""
+    frames = fuzz_frames(BENCHMARK_FRAMES, seed=1)
+    device = EtekcityBPDevice()
+
+    started = time.perf_counter()
+    for timestamp, frame in enumerate(frames):
+        device.process_frame(frame, float(timestamp))
+    frames_per_second = BENCHMARK_FRAMES / (time.perf_counter() - started)
+
+    print(f"Decoded {frames_per_second:,.0f} frames per second")
+    assert frames_per_second >= MIN_FRAMES_PER_SECOND
@@ -0,0 +1,58 @@
+"""Tests for the EtekcityBP measurement history."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.etekcitybp_ble.device import EtekcityBPMeasurement
+from custom_components.etekcitybp_ble.history import EtekcityBPHistory
+
+
+def _measurement(timestamp: float, systolic: int = 120) -> EtekcityBPMeasurement:
+    return EtekcityBPMeasurement(timestamp, 0, systolic, 80, 70, False, False)
+
+
+async def test_export_cursor_includes_backfilled_measurements(
+    hass: HomeAssistant,
+) -> None:
+    """Test measurements added after a cursor are found whatever their time."""
+    history = EtekcityBPHistory(hass, "entry")
+    history.async_add_many([_measurement(1000), _measurement(2000)])
+    cursor = history.last_sequence
+
+    history.async_add(_measurement(3000))
+    history.async_add_many([_measurement(500, 130), _measurement(1500, 140)])
+
+    assert [
+        measurement.timestamp for measurement in history.measurements_since(0, cursor)
+    ] == [500, 1500, 3000]
+    assert history.measurements_since(0, history.last_sequence) == []
+
+
+async def test_load_numbers_stored_measurements(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test timestamp cursors of stored histories keep their position."""
+    hass_storage["etekcitybp_ble.history.entry"] = {
+        "version": 1,
+        "key": "etekcitybp_ble.history.entry",
+        "data": {
+            "measurements": [
+                _measurement(timestamp).as_dict() for timestamp in (3000, 1000, 2000)
+            ],
+            "export_cursors": {"csv:0:export.csv": 2000},
+        },
+    }
+    history = EtekcityBPHistory(hass, "entry")
+    await history.async_load()
+
+    cursor = history.export_cursor("csv:0:export.csv")
+    assert [
+        measurement.timestamp for measurement in history.measurements_since(0, cursor)
+    ] == [3000]
+    history.async_add(_measurement(1500, 150))
+    assert [
+        measurement.timestamp for measurement in history.measurements_since(0, cursor)
+    ] == [1500, 3000]
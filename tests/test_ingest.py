@@ -0,0 +1,53 @@
+"""Tests for the EtekcityBP notification log ingestion."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.etekcitybp_ble.device import EtekcityBPMeasurement
+from custom_components.etekcitybp_ble.history import EtekcityBPHistory
+from custom_components.etekcitybp_ble.ingest import BATCH_SIZE, ingest_log
+
+from . import write_log
+from .conftest import ADDRESS
+
+READINGS = 10_000
+
+
+def test_ingest_log_yields_bounded_batches(tmp_path: Path) -> None:
+    """Test the measurements of a log are yielded in batches."""
+    path = tmp_path / "home-assistant.log.gz"
+    write_log(path, ADDRESS, READINGS)
+
+    batches = list(ingest_log(str(path), ADDRESS))
+
+    assert sum(len(batch) for batch in batches) == READINGS
+    assert max(len(batch) for batch in batches) == BATCH_SIZE
+
+
+async def test_add_many_matches_adding_one_by_one(hass: HomeAssistant) -> None:
+    """Test merging a time-ordered batch gives the same history as inserting one by one."""
+    rng = random.Random(0)
+    measurements = sorted(
+        (
+            EtekcityBPMeasurement(
+                rng.randrange(100_000), rng.randrange(2), rng.choice([120, 130]), 80, 70, False, False
+            )
+            for _ in range(3_000)
+        ),
+        key=lambda measurement: measurement.timestamp,
+    )
+    one_by_one = EtekcityBPHistory(hass, "one_by_one")
+    batched = EtekcityBPHistory(hass, "batched")
+    for history in (one_by_one, batched):
+        history.async_add_many(measurements[::3])
+    backfill = [measurement for index, measurement in enumerate(measurements) if index % 3]
+
+    added = sum(one_by_one.async_add(measurement) for measurement in backfill)
+
+    assert batched.async_add_many(backfill) == added
+    for user in (0, 1):
+        assert batched.measurements(user) == one_by_one.measurements(user)
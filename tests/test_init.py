@@ -0,0 +1,44 @@
+"""Tests for setting up and removing EtekcityBP config entries."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.etekcitybp_ble.device import EtekcityBPMeasurement
+
+pytestmark = [
+    # The mocked Bluetooth scanner leaves its device expiry timer behind
+    pytest.mark.parametrize("expected_lingering_timers", [True]),
+    pytest.mark.usefixtures("enable_bluetooth"),
+]
+
+
+async def test_remove_entry_removes_stores(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, hass_storage: dict[str, Any]
+) -> None:
+    """Test the history and schedule of a deleted monitor are removed."""
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+    coordinator.history.async_add(
+        EtekcityBPMeasurement(1740815100, 0, 120, 80, 70, False, False)
+    )
+    coordinator.predictor.async_record_latency(4.0)
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    history_key = f"etekcitybp_ble.history.{mock_config_entry.entry_id}"
+    schedule_key = f"etekcitybp_ble.schedule.{mock_config_entry.entry_id}"
+    assert history_key in hass_storage
+    assert schedule_key in hass_storage
+
+    assert await hass.config_entries.async_remove(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert history_key not in hass_storage
+    assert schedule_key not in hass_storage
@@ -0,0 +1,116 @@
+"""Tests for the EtekcityBP person timelines."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from homeassistant.const import CONF_ADDRESS, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.etekcitybp_ble.const import DOMAIN
+from custom_components.etekcitybp_ble.device import EtekcityBPMeasurement
+from custom_components.etekcitybp_ble.people import async_get_people
+
+pytestmark = [
+    # The mocked Bluetooth scanner leaves its device expiry timer behind
+    pytest.mark.parametrize("expected_lingering_timers", [True]),
+    pytest.mark.usefixtures("enable_bluetooth"),
+]
+
+PERSON = "person.jo"
+SYSTOLIC = "sensor.jo_blood_pressure_systolic_pressure"
+
+
+def _entry(address: str, *options: str) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=address,
+        data={CONF_ADDRESS: address},
+        options=dict.fromkeys(options, PERSON),
+    )
+
+
+async def test_person_entities_follow_the_mapped_monitors(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry
+) -> None:
+    """Test person entities are pushed and move to another monitor on unload."""
+    first = _entry("AA:BB:CC:DD:EE:01", "person_user1")
+    second = _entry("AA:BB:CC:DD:EE:02", "person_user2")
+    for entry in (first, second):
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entity_registry.async_get(SYSTOLIC).config_entry_id == first.entry_id
+
+    now = time.time()
+    first.runtime_data.history.async_add(
+        EtekcityBPMeasurement(now - 60, 0, 128, 82, 70, False, False)
+    )
+    second.runtime_data.history.async_add(
+        EtekcityBPMeasurement(now, 1, 135, 85, 72, False, False)
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(SYSTOLIC).state == "135"
+    assert hass.states.get("sensor.jo_blood_pressure_readings_7_days").state == "2"
+
+    assert await hass.config_entries.async_unload(first.entry_id)
+    await hass.async_block_till_done()
+
+    assert entity_registry.async_get(SYSTOLIC).config_entry_id == second.entry_id
+    assert hass.states.get(SYSTOLIC).state == "135"
+    assert hass.states.get("sensor.jo_blood_pressure_readings_7_days").state == "1"
+
+    assert await hass.config_entries.async_unload(second.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(SYSTOLIC).state == STATE_UNAVAILABLE
+
+
+async def test_person_on_both_user_slots(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a person mapped to both user slots of a monitor gets one set of entities."""
+    entry = _entry("AA:BB:CC:DD:EE:01", "person_user1", "person_user2")
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    now = time.time()
+    entry.runtime_data.history.async_add_many(
+        [
+            EtekcityBPMeasurement(now - 60, 0, 128, 82, 70, False, False),
+            EtekcityBPMeasurement(now, 1, 135, 85, 72, False, False),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    assert "already exists" not in caplog.text
+    assert hass.states.get(SYSTOLIC).state == "135"
+    assert hass.states.get("sensor.jo_blood_pressure_readings_7_days").state == "2"
+
+
+async def test_batch_notifies_once(hass: HomeAssistant) -> None:
+    """Test a batch of imported measurements updates a person once."""
+    entry = _entry("AA:BB:CC:DD:EE:01", "person_user1")
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    notified = []
+    async_get_people(hass).async_add_listener(PERSON, lambda: notified.append(True))
+
+    now = time.time()
+    entry.runtime_data.history.async_add_many(
+        [
+            EtekcityBPMeasurement(now - 3600 * index, 0, 120 + index % 20, 80, 70, False, False)
+            for index in range(100)
+        ]
+    )
+    await hass.async_block_till_done()
+
+    assert len(notified) == 1
+    assert hass.states.get(SYSTOLIC).state == "120"
+    assert hass.states.get("sensor.jo_blood_pressure_readings_7_days").state == "100"
@@ -0,0 +1,48 @@
+"""Tests for the EtekcityBP measurement schedule predictor."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.etekcitybp_ble.device import EtekcityBPMeasurement
+from custom_components.etekcitybp_ble.predictor import (
+    MIN_MEASUREMENTS,
+    EtekcityBPSchedulePredictor,
+)
+
+
+def _measurement(measured_at: datetime) -> EtekcityBPMeasurement:
+    return EtekcityBPMeasurement(measured_at.timestamp(), 0, 120, 80, 70, False, False)
+
+
+async def test_hit_rate_counts_trained_measurements(hass: HomeAssistant) -> None:
+    """Test the hit rate only counts measurements taken once trained."""
+    predictor = EtekcityBPSchedulePredictor(hass, "entry")
+    morning = dt_util.as_local(datetime(2025, 3, 1, 7, 10, tzinfo=dt_util.UTC))
+
+    for day in range(MIN_MEASUREMENTS):
+        predictor.async_record(_measurement(morning + timedelta(days=day)))
+    assert predictor.trained
+    assert predictor.hit_rate is None
+
+    predictor.async_record(_measurement(morning + timedelta(days=MIN_MEASUREMENTS)))
+    predictor.async_record(
+        _measurement(morning + timedelta(days=MIN_MEASUREMENTS + 1, hours=12))
+    )
+    assert predictor.hit_rate == 0.5
+
+
+async def test_in_window(hass: HomeAssistant) -> None:
+    """Test the predicted window covers the usual measurement time once trained."""
+    predictor = EtekcityBPSchedulePredictor(hass, "entry")
+    morning = dt_util.as_local(datetime(2025, 3, 1, 7, 10, tzinfo=dt_util.UTC))
+    assert not predictor.in_window(morning)
+
+    for day in range(MIN_MEASUREMENTS):
+        predictor.async_record(_measurement(morning + timedelta(days=day)))
+
+    assert predictor.in_window(morning + timedelta(days=30, minutes=20))
+    assert not predictor.in_window(morning + timedelta(days=30, hours=6))
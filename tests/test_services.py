@@ -0,0 +1,217 @@
+"""Tests for the EtekcityBP device command services."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.const import ATTR_DEVICE_ID, CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.etekcitybp_ble.const import (
+    CHARACTERISTIC_COMMAND,
+    CONF_DEVICE_COMMANDS,
+    DOMAIN,
+)
+from custom_components.etekcitybp_ble.device import (
+    EtekcityBPMeasurement,
+    build_request_history_command,
+    build_set_display_units_command,
+    build_sync_time_command,
+)
+
+from . import continuation_frame, measurement_frame, write_log
+from .conftest import ADDRESS
+
+pytestmark = [
+    # The mocked Bluetooth scanner leaves its device expiry timer behind
+    pytest.mark.parametrize("expected_lingering_timers", [True]),
+    pytest.mark.usefixtures("enable_bluetooth"),
+]
+
+
+async def _async_setup(hass: HomeAssistant, entry: MockConfigEntry) -> str:
+    """Set up a config entry and return the id of its device."""
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    device = dr.async_get(hass).async_get_device(
+        connections={(dr.CONNECTION_BLUETOOTH, ADDRESS)}
+    )
+    assert device is not None
+    return device.id
+
+
+async def test_device_commands_need_opt_in(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test the device command services are refused until they are enabled."""
+    device_id = await _async_setup(hass, mock_config_entry)
+
+    with pytest.raises(ServiceValidationError, match="not enabled"):
+        await hass.services.async_call(
+            DOMAIN, "sync_time", {ATTR_DEVICE_ID: device_id}, blocking=True
+        )
+    assert not mock_config_entry.runtime_data._commands
+
+
+async def test_queued_commands(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test commands replace queued ones and are built when they are written."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=ADDRESS,
+        data={CONF_ADDRESS: ADDRESS},
+        options={CONF_DEVICE_COMMANDS: True},
+    )
+    device_id = await _async_setup(hass, entry)
+    freezer.move_to(datetime(2025, 3, 1, 7, 0, tzinfo=dt_util.UTC))
+
+    for units in ("kPa", "mmHg"):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_display_units",
+            {ATTR_DEVICE_ID: device_id, "units": units},
+            blocking=True,
+        )
+    for _ in range(3):
+        await hass.services.async_call(
+            DOMAIN, "sync_time", {ATTR_DEVICE_ID: device_id}, blocking=True
+        )
+    for user in (2, 1, 2):
+        await hass.services.async_call(
+            DOMAIN,
+            "request_history",
+            {ATTR_DEVICE_ID: device_id, "user": user},
+            blocking=True,
+        )
+
+    freezer.move_to(datetime(2025, 3, 1, 9, 30, tzinfo=dt_util.UTC))
+    client = AsyncMock()
+    await entry.runtime_data._async_send_commands(client)
+
+    assert [call.args for call in client.write_gatt_char.call_args_list] == [
+        (CHARACTERISTIC_COMMAND, build_set_display_units_command("mmHg")),
+        (CHARACTERISTIC_COMMAND, build_sync_time_command(dt_util.now())),
+        (CHARACTERISTIC_COMMAND, build_request_history_command(0)),
+        (CHARACTERISTIC_COMMAND, build_request_history_command(1)),
+    ]
+    assert not entry.runtime_data._commands
+
+
+async def test_history_replies_are_not_committed(hass: HomeAssistant) -> None:
+    """Test notifications after a history request are not taken as new readings."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=ADDRESS,
+        data={CONF_ADDRESS: ADDRESS},
+        options={CONF_DEVICE_COMMANDS: True},
+    )
+    device_id = await _async_setup(hass, entry)
+    coordinator = entry.runtime_data
+    await hass.services.async_call(
+        DOMAIN, "request_history", {ATTR_DEVICE_ID: device_id, "user": 1}, blocking=True
+    )
+
+    await coordinator._async_send_commands(AsyncMock())
+    for frame in (measurement_frame(0, 120, 80), continuation_frame(70)):
+        await coordinator._notification_handler(13, frame)
+
+    assert coordinator.history.measurements(0) == []
+    assert coordinator.device.sensor_data["systolic0"] is None
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/tmp/export.csv", "../export.csv", "exports/../../export.csv", "www_link/export.csv"],
+)
+async def test_export_history_rejects_paths_outside_directory(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, tmp_path: Path, path: str
+) -> None:
+    """Test exports cannot leave their directory, also not into www."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "www").mkdir()
+    (tmp_path / "etekcitybp_ble_exports").mkdir()
+    (tmp_path / "etekcitybp_ble_exports" / "www_link").symlink_to(tmp_path / "www")
+    device_id = await _async_setup(hass, mock_config_entry)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "export_history",
+            {ATTR_DEVICE_ID: device_id, "user": 1, "path": path},
+            blocking=True,
+            return_response=True,
+        )
+    assert not list((tmp_path / "www").iterdir())
+
+
+async def test_export_history(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, tmp_path: Path
+) -> None:
+    """Test the history is exported below the export directory."""
+    hass.config.config_dir = str(tmp_path)
+    device_id = await _async_setup(hass, mock_config_entry)
+    mock_config_entry.runtime_data.history.async_add(
+        EtekcityBPMeasurement(1740815100, 0, 120, 80, 70, False, False)
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "export_history",
+        {ATTR_DEVICE_ID: device_id, "user": 1, "path": "nightly/user1.csv"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {"exported": 1}
+    assert (tmp_path / "etekcitybp_ble_exports" / "nightly" / "user1.csv").read_text(
+        encoding="utf-8"
+    ).splitlines()[1:] == ["2025-03-01T07:45:00+00:00,1,120,80,70,false,false"]
+
+
+async def test_import_log(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, tmp_path: Path
+) -> None:
+    """Test logs in the configuration directory are imported."""
+    hass.config.config_dir = str(tmp_path)
+    write_log(tmp_path / "home-assistant.log.1", ADDRESS, 10)
+    device_id = await _async_setup(hass, mock_config_entry)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "import_log",
+        {ATTR_DEVICE_ID: device_id, "path": "home-assistant.log.1"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {"found": 10, "imported": 10}
+
+
+@pytest.mark.parametrize("path", ["/var/log/syslog", "../home-assistant.log", "www/log"])
+async def test_import_log_rejects_paths_outside_config(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, tmp_path: Path, path: str
+) -> None:
+    """Test logs cannot be read from outside the configuration directory or www."""
+    hass.config.config_dir = str(tmp_path / "config")
+    device_id = await _async_setup(hass, mock_config_entry)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "import_log",
+            {ATTR_DEVICE_ID: device_id, "path": path},
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,84 @@
+"""Import and setup time benchmark of the EtekcityBP integration."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.etekcitybp_ble.const import DOMAIN
+
+ENTRIES = 30
+# Budgets on top of the Home Assistant components the integration uses.
+# Importing takes about 20 ms and setting up 30 entries about 0.5 s on a
+# desktop CPU, the budgets leave room for slow CI runners.
+IMPORT_BUDGET = 0.5
+SETUP_BUDGET = 3.0
+
+IMPORT_SCRIPT = """
+import sys
+import time
+import homeassistant.components.bluetooth
+import homeassistant.components.sensor
+import homeassistant.components.binary_sensor
+import homeassistant.components.websocket_api
+started = time.perf_counter()
+import custom_components.etekcitybp_ble
+import custom_components.etekcitybp_ble.binary_sensor
+import custom_components.etekcitybp_ble.config_flow
+import custom_components.etekcitybp_ble.sensor
+print(time.perf_counter() - started)
+print("numpy" in sys.modules)
+"""
+
+
+def test_import_time() -> None:
+    """Test importing the integration stays within the budget."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    elapsed, numpy_loaded = result.stdout.split()
+    seconds = float(elapsed)
+
+    print(f"Imported the integration in {seconds * 1000:.0f} ms")
+    assert seconds < IMPORT_BUDGET
+    assert numpy_loaded == "False"
+
+
+# The mocked Bluetooth scanner leaves its device expiry timer behind
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+@pytest.mark.usefixtures("enable_bluetooth")
+async def test_setup_time(hass: HomeAssistant) -> None:
+    """Test setting up many config entries stays within the budget."""
+    addresses = [f"AA:BB:CC:DD:EE:{index:02X}" for index in range(ENTRIES)]
+    entries = [
+        MockConfigEntry(domain=DOMAIN, unique_id=address, data={CONF_ADDRESS: address})
+        for address in addresses
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+
+    started = time.perf_counter()
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    seconds = time.perf_counter() - started
+
+    print(f"Set up {ENTRIES} entries in {seconds * 1000:.0f} ms")
+    assert all(entry.state is ConfigEntryState.LOADED for entry in entries)
+    assert seconds < SETUP_BUDGET
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
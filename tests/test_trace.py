@@ -0,0 +1,29 @@
+"""Tests for the EtekcityBP connection cycle tracer."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.etekcitybp_ble.trace import EtekcityBPTracer
+
+CYCLES = 500
+
+
+async def test_cycles_are_written_in_order(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test cycles finished back to back are written whole and in order."""
+    path = tmp_path / "trace.jsonl"
+    tracer = EtekcityBPTracer(hass, "AA:BB:CC:DD:EE:FF", str(path))
+
+    for _ in range(CYCLES):
+        cycle = tracer.start_cycle()
+        cycle.phase("connect")
+        cycle.frame(bytes(20))
+        tracer.finish_cycle(cycle)
+    await tracer.async_close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["cycle"] for record in records] == list(range(1, CYCLES + 1))
+    assert records[0]["phases"][0]["name"] == "connect"
@@ -0,0 +1,125 @@
+"""Tests for the EtekcityBP websocket API."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from custom_components.etekcitybp_ble.device import EtekcityBPMeasurement
+
+from .conftest import ADDRESS
+
+pytestmark = [
+    # The mocked Bluetooth scanner leaves its device expiry timer behind
+    pytest.mark.parametrize("expected_lingering_timers", [True]),
+    pytest.mark.usefixtures("enable_bluetooth"),
+]
+
+MORNING = datetime(2025, 3, 1, 7, 0, tzinfo=dt_util.UTC).timestamp()
+DAY = 86400
+
+
+async def _async_setup(hass: HomeAssistant, entry: MockConfigEntry) -> str:
+    """Set up a config entry and return the id of its device."""
+    await hass.config.async_set_time_zone("UTC")
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    device = dr.async_get(hass).async_get_device(
+        connections={(dr.CONNECTION_BLUETOOTH, ADDRESS)}
+    )
+    assert device is not None
+    return device.id
+
+
+async def _async_fetch_pages(
+    hass_ws_client: WebSocketGenerator, hass: HomeAssistant, key: str, **request: Any
+) -> list[list[dict[str, Any]]]:
+    """Fetch every page of a history request."""
+    client = await hass_ws_client(hass)
+    pages: list[list[dict[str, Any]]] = []
+    cursor = None
+    while True:
+        await client.send_json_auto_id(
+            {"type": "etekcitybp_ble/history", **request}
+            | ({} if cursor is None else {"cursor": cursor})
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        pages.append(response["result"][key])
+        if (cursor := response["result"]["next_cursor"]) is None:
+            return pages
+
+
+async def test_pages_keep_readings_sharing_a_timestamp(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test readings with the same timestamp are not skipped across pages."""
+    device_id = await _async_setup(hass, mock_config_entry)
+    # Two readings per timestamp, a page boundary falls between them
+    mock_config_entry.runtime_data.history.async_add_many(
+        EtekcityBPMeasurement(MORNING + index // 2, 0, 110 + index, 70, 70, False, False)
+        for index in range(7)
+    )
+
+    pages = await _async_fetch_pages(
+        hass_ws_client, hass, "measurements", device_id=device_id, user=1, limit=3
+    )
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [reading["systolic"] for page in pages for reading in page] == list(
+        range(110, 117)
+    )
+
+
+async def test_daily_downsampling(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test readings are summarised per day and paged by days."""
+    device_id = await _async_setup(hass, mock_config_entry)
+    mock_config_entry.runtime_data.history.async_add_many(
+        [
+            EtekcityBPMeasurement(MORNING, 0, 120, 80, 60, False, False),
+            EtekcityBPMeasurement(MORNING + 3600, 0, 130, 84, 70, False, False),
+            EtekcityBPMeasurement(MORNING + 7200, 0, 140, 90, 80, False, False),
+            EtekcityBPMeasurement(MORNING + DAY, 0, 125, 82, 66, False, False),
+            EtekcityBPMeasurement(MORNING + 3 * DAY, 0, 118, 76, 64, False, False),
+            EtekcityBPMeasurement(MORNING + 3 * DAY, 1, 150, 95, 90, False, False),
+        ]
+    )
+
+    pages = await _async_fetch_pages(
+        hass_ws_client,
+        hass,
+        "days",
+        device_id=device_id,
+        user=1,
+        downsample="daily",
+        limit=2,
+    )
+
+    assert [[day["date"] for day in page] for page in pages] == [
+        ["2025-03-01", "2025-03-02"],
+        ["2025-03-04"],
+    ]
+    assert pages[0][0] == {
+        "date": "2025-03-01",
+        "count": 3,
+        "systolic": {"min": 120, "mean": 130.0, "max": 140},
+        "diastolic": {"min": 80, "mean": 84.7, "max": 90},
+        "pulse": {"min": 60, "mean": 70.0, "max": 80},
+    }
+    assert pages[1][0]["count"] == 1